@@ -0,0 +1,111 @@
+import os
+import math
+import time
+import asyncio
+import threading
+from collections import OrderedDict
+from fastapi import HTTPException
+
+# Admission control for /ask: bounded concurrency, bounded queueing and
+# per-client token buckets so that a slow LLM cannot pile up unbounded work.
+MAX_IN_FLIGHT = int(os.getenv("ASK_MAX_IN_FLIGHT", "16"))
+MAX_QUEUED = int(os.getenv("ASK_MAX_QUEUED", "32"))
+MAX_QUEUE_WAIT = float(os.getenv("ASK_MAX_QUEUE_WAIT_SECONDS", "2.0"))
+# Past this many in-flight requests, answers are served retrieval-only
+DEGRADE_AT = int(os.getenv("ASK_DEGRADE_IN_FLIGHT", str(max(1, MAX_IN_FLIGHT * 3 // 4))))
+RETRY_AFTER_SECONDS = int(os.getenv("ASK_RETRY_AFTER_SECONDS", "2"))
+
+RATE_LIMIT_PER_SECOND = float(os.getenv("ASK_RATE_LIMIT_PER_SECOND", "2.0"))
+RATE_LIMIT_BURST = float(os.getenv("ASK_RATE_LIMIT_BURST", "10"))
+MAX_TRACKED_CLIENTS = 10000
+# Comma-separated API keys that get their own bucket; any other X-API-Key is
+# ignored and the client is limited by address
+API_KEYS = frozenset(k.strip() for k in os.getenv("ASK_API_KEYS", "").split(",") if k.strip())
+
+
+class AdmissionController:
+    """Concurrency gate that sheds load instead of queueing without bound."""
+
+    def __init__(self, max_in_flight: int = MAX_IN_FLIGHT, max_queued: int = MAX_QUEUED,
+                 max_wait: float = MAX_QUEUE_WAIT, degrade_at: int = DEGRADE_AT) -> None:
+        self.max_in_flight = max_in_flight
+        self.max_queued = max_queued
+        self.max_wait = max_wait
+        self.degrade_at = degrade_at
+        self.in_flight = 0
+        self.queued = 0
+        self._semaphore = None
+
+    def _sem(self) -> asyncio.Semaphore:
+        # Created lazily so it binds to the running event loop
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_in_flight)
+        return self._semaphore
+
+    def _shed(self, reason: str) -> HTTPException:
+        return HTTPException(
+            status_code=503,
+            detail=f"Service overloaded ({reason}), please retry later.",
+            headers={"Retry-After": str(RETRY_AFTER_SECONDS)},
+        )
+
+    async def acquire(self) -> bool:
+        """Waits for a slot; returns True when the request should run degraded."""
+        sem = self._sem()
+        if sem.locked():
+            if self.queued >= self.max_queued:
+                raise self._shed("queue full")
+            self.queued += 1
+            try:
+                await asyncio.wait_for(sem.acquire(), timeout=self.max_wait)
+            except asyncio.TimeoutError:
+                raise self._shed("queue wait exceeded")
+            finally:
+                self.queued -= 1
+        else:
+            await sem.acquire()
+        self.in_flight += 1
+        return self.in_flight > self.degrade_at or self.queued > 0
+
+    def release(self) -> None:
+        self.in_flight -= 1
+        self._sem().release()
+
+
+class RateLimiter:
+    """Per-client token bucket keyed by configured API key (or client address)."""
+
+    def __init__(self, rate: float = RATE_LIMIT_PER_SECOND, burst: float = RATE_LIMIT_BURST,
+                 max_clients: int = MAX_TRACKED_CLIENTS) -> None:
+        self.rate = rate
+        self.burst = burst
+        self.max_clients = max_clients
+        self._buckets: "OrderedDict[str, tuple]" = OrderedDict()
+        # Shared by async handlers and threadpool (sync) handlers
+        self._lock = threading.Lock()
+
+    def check(self, client_key: str) -> None:
+        if self.rate <= 0:
+            return
+        with self._lock:
+            self._take(client_key)
+
+    def _take(self, client_key: str) -> None:
+        now = time.monotonic()
+        tokens, last = self._buckets.pop(client_key, (self.burst, now))
+        tokens = min(self.burst, tokens + (now - last) * self.rate)
+        if tokens < 1.0:
+            self._buckets[client_key] = (tokens, now)
+            retry_after = math.ceil((1.0 - tokens) / self.rate)
+            raise HTTPException(
+                status_code=429,
+                detail="Rate limit exceeded.",
+                headers={"Retry-After": str(retry_after)},
+            )
+        self._buckets[client_key] = (tokens - 1.0, now)
+        while len(self._buckets) > self.max_clients:
+            self._buckets.popitem(last=False)
+
+
+admission = AdmissionController()
+rate_limiter = RateLimiter()
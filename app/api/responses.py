@@ -0,0 +1,38 @@
+from typing import Any, Dict, Iterable, Optional
+from fastapi import Request
+from fastapi.responses import Response
+from pydantic import BaseModel
+
+MSGPACK_MEDIA_TYPES = ("application/msgpack", "application/x-msgpack")
+
+class ORJSONResponse(Response):
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        import orjson
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+class MsgPackResponse(Response):
+    media_type = "application/msgpack"
+
+    def render(self, content: Any) -> bytes:
+        import msgpack  # only needed when a client negotiates msgpack
+        return msgpack.packb(content, use_bin_type=True)
+
+def shape_payload(response: BaseModel, fields: Optional[Iterable[str]] = None,
+                  snippet_chars: Optional[int] = None) -> Dict[str, Any]:
+    # Trim at the server: drop unrequested top-level fields and cut proof snippets
+    payload = response.model_dump(include=set(fields) if fields else None)
+    proof = payload.get("proof")
+    if snippet_chars is not None and proof:
+        for source in proof.get("sources", []):
+            source["text_snippet"] = source["text_snippet"][:snippet_chars]
+    return payload
+
+def render(raw_request: Request, payload: Dict[str, Any]) -> Response:
+    # Returning a Response directly skips FastAPI's second validation pass
+    # through response_model and its jsonable_encoder walk
+    accept = raw_request.headers.get("accept", "")
+    if any(media_type in accept for media_type in MSGPACK_MEDIA_TYPES):
+        return MsgPackResponse(payload, headers={"Vary": "Accept"})
+    return ORJSONResponse(payload, headers={"Vary": "Accept"})
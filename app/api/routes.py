@@ -1,16 +1,122 @@
-from fastapi import APIRouter, HTTPException
-from schemas.request import AskRequest
-from schemas.response import AskResponse
-from app.services.answer_service import get_answer
+import asyncio
+import hashlib
+import threading
+from datetime import datetime, timezone
+from typing import Any, List
+from fastapi import APIRouter, HTTPException, Request
+from starlette.concurrency import run_in_threadpool
+from schemas.request import AskRequest, SearchRequest
+from schemas.response import AskResponse, SearchResponse
+from app.services.answer_service import get_answer, RequestCancelled
+from app.services.search_service import search
+from app.api.admission import admission, rate_limiter, API_KEYS
+from app.api.responses import render, shape_payload
+from app.core.trace import RequestTrace, start_trace
+from app.core.query_log import log_request, should_sample
 import traceback
 
 router = APIRouter()
 
+DISCONNECT_POLL_SECONDS = 0.25
+
+def _client_key(raw_request: Request) -> str:
+    # Unknown keys are not trusted: minting a new one per request would
+    # otherwise get a fresh bucket each time and evict everyone else's
+    api_key = raw_request.headers.get("x-api-key")
+    if api_key and api_key in API_KEYS:
+        return f"key:{api_key}"
+    return f"ip:{raw_request.client.host if raw_request.client else 'unknown'}"
+
+async def _wait_for_disconnect(raw_request: Request) -> None:
+    while not await raw_request.is_disconnected():
+        await asyncio.sleep(DISCONNECT_POLL_SECONDS)
+
+def _log_request(trace: RequestTrace, endpoint: str, query: str, status: int,
+                 section_ids: List[str], **extra: Any) -> None:
+    log_request({
+        "ts": datetime.now(timezone.utc).isoformat(),
+        "endpoint": endpoint,
+        "query": query,
+        "normalized_query": " ".join(query.lower().split()),
+        "status": status,
+        "section_ids": section_ids,
+        "timings_ms": {**trace.timings_ms, "total": round(trace.elapsed_ms(), 3)},
+        "cache": trace.cache,
+        **trace.fields,
+        **extra,
+    })
+
 @router.post("/ask", response_model=AskResponse)
-def ask_law(request: AskRequest):
+async def ask_law(request: AskRequest, raw_request: Request):
+    rate_limiter.check(_client_key(raw_request))
+    degraded = await admission.acquire()
+
+    # Set before the worker task is created so its copied context carries it
+    trace = start_trace(should_sample())
+    status, result = 500, None
+    try:
+        cancel_event = threading.Event()
+        work = asyncio.ensure_future(run_in_threadpool(
+            get_answer, request.query, synthesize=not degraded, cancel_event=cancel_event
+        ))
+        # The slot is held until the worker thread actually finishes, even if the
+        # client is gone, so in-flight accounting matches real upstream load
+        work.add_done_callback(lambda _: admission.release())
+        disconnect = asyncio.ensure_future(_wait_for_disconnect(raw_request))
+
+        try:
+            done, _ = await asyncio.wait({work, disconnect}, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            disconnect.cancel()
+
+        if work not in done:
+            # Client went away: stop before any further retrieval / LLM work
+            cancel_event.set()
+            # Consume the eventual result so the abandoned future is not reported
+            work.add_done_callback(lambda f: f.cancelled() or f.exception())
+            status = 499
+            raise HTTPException(status_code=499, detail="Client closed request")
+
+        try:
+            result = work.result()
+            status = 200
+        except RequestCancelled:
+            status = 499
+            raise HTTPException(status_code=499, detail="Client closed request")
+        except Exception as e:
+            print(f"ERROR processing request: {e}")
+            traceback.print_exc()
+            raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        if trace is not None:
+            _log_request(
+                trace, "/ask", request.query, status,
+                [f"{c.act}:{c.section}" for c in result.citations] if result else [],
+                degraded=degraded,
+                confidence=result.confidence if result else None,
+                answer_sha=hashlib.sha256(result.answer.encode("utf-8")).hexdigest()[:16] if result else None,
+            )
+
+    return render(raw_request, shape_payload(result, request.fields, request.snippet_chars))
+
+@router.post("/search", response_model=SearchResponse)
+def search_law(request: SearchRequest, raw_request: Request):
+    rate_limiter.check(_client_key(raw_request))
+    trace = start_trace(should_sample())
+    status, result = 500, None
     try:
-        return get_answer(request.query)
+        result = search(request)
+        status = 200
     except Exception as e:
-        print(f"ERROR processing request: {e}")
+        print(f"ERROR processing search: {e}")
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        if trace is not None:
+            _log_request(
+                trace, "/search", request.query, status,
+                [f"{m.act}:{m.section}" for m in result.matches] if result else [],
+                top_k=request.top_k, offset=request.offset, act=request.act,
+            )
+
+    return render(raw_request, shape_payload(result))
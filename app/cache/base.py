@@ -0,0 +1,101 @@
+import time
+import hashlib
+import threading
+from abc import ABC, abstractmethod
+from typing import Callable, Dict, Optional
+
+# Bump to invalidate every cached entry after a format change
+CACHE_VERSION = "v1"
+KEY_PREFIX = "ilap"
+
+def make_key(namespace: str, version: str, payload: str) -> str:
+    # Versioned, fixed-length keys: ilap:v1:<namespace>:<version>:<sha256>
+    digest = hashlib.sha256(payload.encode("utf-8")).hexdigest()
+    return f"{KEY_PREFIX}:{CACHE_VERSION}:{namespace}:{version}:{digest}"
+
+
+class CacheBackend(ABC):
+    """Byte-oriented key-value cache shared by embedding, retrieval and answer caching."""
+
+    def __init__(self) -> None:
+        self._inflight: Dict[str, threading.Event] = {}
+        self._inflight_lock = threading.Lock()
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[bytes]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def set(self, key: str, value: bytes, ttl: Optional[int] = None) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def add(self, key: str, value: bytes, ttl: Optional[int] = None) -> bool:
+        # Set only if absent; returns True when the key was written
+        raise NotImplementedError
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        raise NotImplementedError
+
+    def get_or_compute(self, key: str, compute: Callable[[], Optional[bytes]],
+                       ttl: Optional[int] = None, lock_ttl: int = 30,
+                       poll_interval: float = 0.05) -> Optional[bytes]:
+        value = self.get(key)
+        if value is not None:
+            return value
+
+        # Stampede protection, step 1: one computation per key in this process
+        with self._inflight_lock:
+            event = self._inflight.get(key)
+            leader = event is None
+            if leader:
+                event = self._inflight[key] = threading.Event()
+
+        if not leader:
+            event.wait(lock_ttl)
+            value = self.get(key)
+            return value if value is not None else compute()
+
+        try:
+            # Step 2: one computation per key across processes sharing the backend
+            lock_key = f"{key}:lock"
+            deadline = time.monotonic() + lock_ttl
+            while not self.add(lock_key, b"1", ttl=lock_ttl):
+                time.sleep(poll_interval)
+                value = self.get(key)
+                if value is not None:
+                    return value
+                if time.monotonic() > deadline:
+                    break
+            try:
+                # compute may return None to signal "do not store this result"
+                value = compute()
+                if value is not None:
+                    self.set(key, value, ttl)
+            finally:
+                self.delete(lock_key)
+            return value
+        finally:
+            with self._inflight_lock:
+                self._inflight.pop(key, None)
+            event.set()
+
+
+class NullCache(CacheBackend):
+    """Disables caching while keeping call sites unconditional."""
+
+    def get(self, key: str) -> Optional[bytes]:
+        return None
+
+    def set(self, key: str, value: bytes, ttl: Optional[int] = None) -> None:
+        pass
+
+    def add(self, key: str, value: bytes, ttl: Optional[int] = None) -> bool:
+        return True
+
+    def delete(self, key: str) -> None:
+        pass
+
+    def get_or_compute(self, key: str, compute: Callable[[], Optional[bytes]], **kwargs) -> Optional[bytes]:
+        return compute()
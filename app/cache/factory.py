@@ -0,0 +1,83 @@
+import os
+from pathlib import Path
+from typing import Any, Callable, Optional
+from app.core.trace import note_cache
+from .base import CacheBackend, NullCache, make_key
+
+# CACHE_BACKEND: none | memory | sqlite | redis
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "memory").lower()
+CACHE_TTL = int(os.getenv("CACHE_TTL_SECONDS", "86400"))
+DEFAULT_SQLITE_PATH = Path(__file__).parent.parent.parent / "cache.sqlite"
+CACHE_SQLITE_PATH = os.getenv("CACHE_SQLITE_PATH", str(DEFAULT_SQLITE_PATH))
+CACHE_REDIS_URL = os.getenv("CACHE_REDIS_URL", "redis://127.0.0.1:6379/0")
+CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", "10000"))
+
+_cache: Optional[CacheBackend] = None
+
+def _build_cache(backend: str) -> CacheBackend:
+    if backend == "memory":
+        from .memory_cache import MemoryCache
+        return MemoryCache(max_entries=CACHE_MAX_ENTRIES)
+    if backend == "sqlite":
+        from .sqlite_cache import SQLiteCache
+        return SQLiteCache(CACHE_SQLITE_PATH, max_entries=CACHE_MAX_ENTRIES)
+    if backend == "redis":
+        from .redis_cache import RedisCache
+        return RedisCache(CACHE_REDIS_URL)
+    return NullCache()
+
+def get_cache() -> CacheBackend:
+    global _cache
+    if _cache is None:
+        try:
+            _cache = _build_cache(CACHE_BACKEND)
+        except Exception as e:
+            # A broken cache must never take the service down
+            print(f"Cache backend '{CACHE_BACKEND}' unavailable, caching disabled: {e}")
+            _cache = NullCache()
+    return _cache
+
+
+class _ComputeFailed(Exception):
+    def __init__(self, original: Exception) -> None:
+        super().__init__(str(original))
+        self.original = original
+
+def cached(namespace: str, version: str, payload: str, compute: Callable[[], Any],
+           dumps: Callable[[Any], bytes], loads: Callable[[bytes], Any],
+           cacheable: Callable[[Any], bool] = lambda value: True,
+           ttl: Optional[int] = CACHE_TTL) -> Any:
+    computed = []
+
+    def produce() -> Optional[bytes]:
+        try:
+            value = compute()
+        except Exception as e:
+            raise _ComputeFailed(e)
+        computed.append(value)
+        return dumps(value) if cacheable(value) else None
+
+    key = make_key(namespace, version, payload)
+    try:
+        raw = get_cache().get_or_compute(key, produce, ttl=ttl)
+    except _ComputeFailed as e:
+        raise e.original
+    except Exception as e:
+        print(f"Cache error ({namespace}): {e}")
+        return computed[0] if computed else compute()
+
+    note_cache(namespace, hit=not computed)
+    if computed:
+        return computed[0]
+    return loads(raw)
+
+def peek(namespace: str, version: str, payload: str,
+         loads: Callable[[bytes], Any]) -> Optional[Any]:
+    # Read-only lookup: never computes and never takes the stampede lock
+    try:
+        raw = get_cache().get(make_key(namespace, version, payload))
+    except Exception as e:
+        print(f"Cache error ({namespace}): {e}")
+        return None
+    note_cache(namespace, hit=raw is not None)
+    return loads(raw) if raw is not None else None
@@ -0,0 +1,22 @@
+from typing import Optional
+from .base import CacheBackend
+
+class RedisCache(CacheBackend):
+    """Cache on any Redis-protocol server (Redis, Valkey, or scripts/redis_standin.py)."""
+
+    def __init__(self, url: str) -> None:
+        super().__init__()
+        import redis  # optional dependency, only needed for this backend
+        self.client = redis.Redis.from_url(url, socket_timeout=1.0)
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self.client.get(key)
+
+    def set(self, key: str, value: bytes, ttl: Optional[int] = None) -> None:
+        self.client.set(key, value, ex=ttl)
+
+    def add(self, key: str, value: bytes, ttl: Optional[int] = None) -> bool:
+        return bool(self.client.set(key, value, ex=ttl, nx=True))
+
+    def delete(self, key: str) -> None:
+        self.client.delete(key)
@@ -0,0 +1,25 @@
+import json
+from array import array
+from typing import Any, List
+from schemas.response import AskResponse
+
+def dump_json(obj: Any) -> bytes:
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+def load_json(raw: bytes) -> Any:
+    return json.loads(raw)
+
+def dump_vector(vector: List[float]) -> bytes:
+    # float32 is plenty for cosine search and 4x smaller than JSON text
+    return array("f", vector).tobytes()
+
+def load_vector(raw: bytes) -> List[float]:
+    values = array("f")
+    values.frombytes(raw)
+    return values.tolist()
+
+def dump_response(response: AskResponse) -> bytes:
+    return response.model_dump_json().encode("utf-8")
+
+def load_response(raw: bytes) -> AskResponse:
+    return AskResponse.model_validate_json(raw)
@@ -0,0 +1,84 @@
+import time
+import sqlite3
+import threading
+from typing import Optional
+from .base import CacheBackend
+
+class SQLiteCache(CacheBackend):
+    """Cache in a shared on-disk SQLite file, usable by every worker on one host."""
+
+    def __init__(self, path: str, max_entries: int = 10000, sweep_every: int = 200) -> None:
+        super().__init__()
+        self.path = path
+        self.max_entries = max_entries
+        self.sweep_every = sweep_every
+        self._local = threading.local()
+        self._writes = 0
+        self._writes_lock = threading.Lock()
+        conn = self._conn()
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache ("
+            "key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL)"
+        )
+        conn.commit()
+        self.sweep()
+
+    def _conn(self) -> sqlite3.Connection:
+        # One connection per thread; WAL lets readers proceed during writes
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def sweep(self) -> None:
+        # Drop expired rows, then the oldest writes beyond max_entries
+        # (INSERT OR REPLACE assigns a new rowid, so rowid order is write order)
+        conn = self._conn()
+        conn.execute("DELETE FROM cache WHERE expires_at <= ?", (time.time(),))
+        conn.execute(
+            "DELETE FROM cache WHERE rowid IN ("
+            "SELECT rowid FROM cache ORDER BY rowid DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,),
+        )
+
+    def _after_write(self) -> None:
+        # Opportunistic maintenance: every worker sweeps every sweep_every of its own writes
+        with self._writes_lock:
+            self._writes += 1
+            due = self._writes % self.sweep_every == 0
+        if due:
+            try:
+                self.sweep()
+            except sqlite3.Error as e:
+                print(f"Cache sweep failed: {e}")
+
+    def get(self, key: str) -> Optional[bytes]:
+        row = self._conn().execute(
+            "SELECT value FROM cache WHERE key = ? AND (expires_at IS NULL OR expires_at > ?)",
+            (key, time.time()),
+        ).fetchone()
+        return bytes(row[0]) if row else None
+
+    def set(self, key: str, value: bytes, ttl: Optional[int] = None) -> None:
+        expires_at = time.time() + ttl if ttl else None
+        self._conn().execute(
+            "INSERT OR REPLACE INTO cache (key, value, expires_at) VALUES (?, ?, ?)",
+            (key, value, expires_at),
+        )
+        self._after_write()
+
+    def add(self, key: str, value: bytes, ttl: Optional[int] = None) -> bool:
+        now = time.time()
+        conn = self._conn()
+        conn.execute("DELETE FROM cache WHERE key = ? AND expires_at <= ?", (key, now))
+        cur = conn.execute(
+            "INSERT OR IGNORE INTO cache (key, value, expires_at) VALUES (?, ?, ?)",
+            (key, value, now + ttl if ttl else None),
+        )
+        return cur.rowcount == 1
+
+    def delete(self, key: str) -> None:
+        self._conn().execute("DELETE FROM cache WHERE key = ?", (key,))
@@ -1,5 +1,4 @@
 import os
-import chromadb
 from pathlib import Path
 from .gemini_embeddings import GeminiEmbeddingFunction
 
@@ -10,6 +9,13 @@ COLLECTION_NAME = os.getenv("CHROMA_COLLECTION", "legal_knowledge_base")
 
 _client = None
 _collection = None
+_emb_fn = None
+
+def get_embedding_function() -> GeminiEmbeddingFunction:
+    global _emb_fn
+    if _emb_fn is None:
+        _emb_fn = GeminiEmbeddingFunction()
+    return _emb_fn
 
 def get_collection():
     global _client, _collection
@@ -17,7 +23,8 @@ def get_collection():
         return _collection
 
     print(f">>> INITIALIZING CHROMA AT: {CHROMA_PATH}")
-    emb_fn = GeminiEmbeddingFunction()
+    emb_fn = get_embedding_function()
+    import chromadb  # deferred: importing chromadb dominates API start-up time
     _client = chromadb.PersistentClient(path=CHROMA_PATH)
 
     # IMPORTANT: embedding_function must match ingest time + query time
@@ -0,0 +1,16 @@
+from pathlib import Path
+
+# Project-level .env, loaded once before any module reads its settings
+ENV_PATH = Path(__file__).parent.parent.parent / ".env"
+
+_loaded = False
+
+def load_env() -> None:
+    global _loaded
+    if _loaded:
+        return
+    _loaded = True
+    # python-dotenv is only imported when there is a file to read
+    if ENV_PATH.exists():
+        from dotenv import load_dotenv
+        load_dotenv(ENV_PATH)
@@ -0,0 +1,78 @@
+import os
+import json
+import queue
+import random
+import atexit
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+# Sampled request log (JSONL) written by a background thread, consumed by
+# scripts/replay_queries.py. Disabled unless QUERY_LOG_SAMPLE_RATE > 0.
+DEFAULT_LOG_PATH = Path(__file__).parent.parent.parent / "logs" / "query_log.jsonl"
+QUERY_LOG_PATH = os.getenv("QUERY_LOG_PATH", str(DEFAULT_LOG_PATH))
+QUERY_LOG_SAMPLE_RATE = float(os.getenv("QUERY_LOG_SAMPLE_RATE", "0"))
+QUERY_LOG_QUEUE_SIZE = int(os.getenv("QUERY_LOG_QUEUE_SIZE", "10000"))
+
+_STOP = object()
+
+
+class QueryLogWriter:
+    def __init__(self, path: str = QUERY_LOG_PATH, max_queue: int = QUERY_LOG_QUEUE_SIZE) -> None:
+        self.path = Path(path)
+        self.dropped = 0
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=max_queue)
+        self._thread = threading.Thread(target=self._run, name="query-log-writer", daemon=True)
+        self._thread.start()
+
+    def write(self, record: Dict[str, Any]) -> None:
+        # Never blocks the request path: drop the record if the writer is behind
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def close(self, timeout: float = 2.0) -> None:
+        try:
+            self._queue.put(_STOP, timeout=timeout)
+        except queue.Full:
+            return
+        self._thread.join(timeout)
+
+    def _run(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as f:
+            while True:
+                item = self._queue.get()
+                # Drain whatever else is queued, then flush once per batch
+                batch = [item]
+                while not self._queue.empty() and len(batch) < 500:
+                    batch.append(self._queue.get_nowait())
+                stop = False
+                for rec in batch:
+                    if rec is _STOP:
+                        stop = True
+                        continue
+                    try:
+                        f.write(json.dumps(rec, ensure_ascii=False, separators=(",", ":")) + "\n")
+                    except (TypeError, ValueError) as e:
+                        print(f"Query log: unserializable record skipped: {e}")
+                f.flush()
+                if stop:
+                    return
+
+
+_writer: Optional[QueryLogWriter] = None
+_writer_lock = threading.Lock()
+
+def should_sample() -> bool:
+    return QUERY_LOG_SAMPLE_RATE > 0 and random.random() < QUERY_LOG_SAMPLE_RATE
+
+def log_request(record: Dict[str, Any]) -> None:
+    global _writer
+    if _writer is None:
+        with _writer_lock:
+            if _writer is None:
+                _writer = QueryLogWriter()
+                atexit.register(_writer.close)
+    _writer.write(record)
@@ -0,0 +1,52 @@
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, Optional
+
+# Per-request trace (stage timings, cache hits) for sampled requests only.
+# The route sets it; worker threads started with run_in_threadpool see the
+# same object through the copied context. Unsampled requests pay one lookup.
+class RequestTrace:
+    def __init__(self) -> None:
+        self.started = time.perf_counter()
+        self.timings_ms: Dict[str, float] = {}
+        self.cache: Dict[str, str] = {}
+        self.fields: Dict[str, Any] = {}
+
+    def elapsed_ms(self) -> float:
+        return (time.perf_counter() - self.started) * 1000.0
+
+
+_current: ContextVar[Optional[RequestTrace]] = ContextVar("request_trace", default=None)
+
+def start_trace(enabled: bool = True) -> Optional[RequestTrace]:
+    # Always (re)set: a keep-alive connection may reuse the previous request's context
+    trace = RequestTrace() if enabled else None
+    _current.set(trace)
+    return trace
+
+def current_trace() -> Optional[RequestTrace]:
+    return _current.get()
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    trace = _current.get()
+    if trace is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = (time.perf_counter() - started) * 1000.0
+        trace.timings_ms[name] = round(trace.timings_ms.get(name, 0.0) + elapsed, 3)
+
+def note_cache(namespace: str, hit: bool) -> None:
+    trace = _current.get()
+    if trace is not None:
+        trace.cache[namespace] = "hit" if hit else "miss"
+
+def annotate(**fields: Any) -> None:
+    trace = _current.get()
+    if trace is not None:
+        trace.fields.update(fields)
@@ -6,6 +6,9 @@ from pathlib import Path
 project_root = Path(__file__).parent.parent.parent
 sys.path.append(str(project_root))
 
+from app.core.config import load_env
+load_env()
+
 from app.services.answer_service import get_answer
 from app.responses.refusals import NO_LAW_FOUND, NON_LEGAL_QUERY
 
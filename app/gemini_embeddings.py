@@ -1,12 +1,16 @@
 import os
 from typing import List, Optional, Union, Any
-from google import genai
+from .cache.base import make_key
+from .cache.factory import get_cache, CACHE_TTL
+from .cache.serialization import dump_vector, load_vector
+from .core.trace import note_cache
 
 class GeminiEmbeddingFunction:
     def __init__(self, api_key: str | None = None, model: str = "text-embedding-004"):
         self.api_key = api_key or os.getenv("GEMINI_API_KEY")
         if not self.api_key:
             raise RuntimeError("GEMINI_API_KEY missing")
+        from google import genai  # heavy SDK, imported only when a client is built
         self.client = genai.Client(api_key=self.api_key)
         self.model = model
 
@@ -14,10 +18,26 @@ class GeminiEmbeddingFunction:
         # Chroma calls this with a list[str]
         # We must batch internally to respect Gemini limits (e.g. 100 per call)
         BATCH_SIZE = 100
-        all_embeddings = []
-        
-        for i in range(0, len(input), BATCH_SIZE):
-            batch = input[i : i + BATCH_SIZE]
+        cache = get_cache()
+        keys = [make_key("embedding", self.model, text) for text in input]
+        all_embeddings: List[Optional[List[float]]] = [None] * len(input)
+
+        for idx, key in enumerate(keys):
+            try:
+                raw = cache.get(key)
+            except Exception as e:
+                print(f"Cache error (embedding): {e}")
+                raw = None
+            if raw is not None:
+                all_embeddings[idx] = load_vector(raw)
+
+        # Only embed texts that were not cached
+        missing = [idx for idx, emb in enumerate(all_embeddings) if emb is None]
+        note_cache("embedding", hit=not missing)
+
+        for i in range(0, len(missing), BATCH_SIZE):
+            batch_idx = missing[i : i + BATCH_SIZE]
+            batch = [input[idx] for idx in batch_idx]
             try:
                 res = self.client.models.embed_content(
                     model=self.model,
@@ -26,7 +46,12 @@ class GeminiEmbeddingFunction:
                 # google-genai returns embeddings aligned with contents
                 # Each embedding object has a .values attribute
                 batch_embeddings = [e.values for e in res.embeddings]
-                all_embeddings.extend(batch_embeddings)
+                for idx, emb in zip(batch_idx, batch_embeddings):
+                    all_embeddings[idx] = emb
+                    try:
+                        cache.set(keys[idx], dump_vector(emb), CACHE_TTL)
+                    except Exception as e:
+                        print(f"Cache error (embedding): {e}")
             except Exception as e:
                 print(f"Error embedding batch {i}: {e}")
                 # In case of error, we might want to raise or return empty/zeros
@@ -1,12 +1,11 @@
 import os
-from dotenv import load_dotenv
+from app.core.config import load_env
 from .base import BaseLLM
 from .local_llm import LocalLLM
 
-# Load environment variables from .env file
-load_dotenv()
-
 def get_llm() -> BaseLLM:
+    # Load environment variables from .env file
+    load_env()
     provider = os.getenv("LLM_PROVIDER", "local").lower()
 
     if provider == "gemini":
@@ -1,9 +1,28 @@
+import os
+from app.core.config import load_env
+
+# Settings are read at import time by the modules below, so load .env first
+load_env()
+
 from fastapi import FastAPI
+from app.api.responses import ORJSONResponse
 from app.api.routes import router
 
+# Responses smaller than this are not worth compressing
+COMPRESSION_MIN_BYTES = int(os.getenv("RESPONSE_COMPRESSION_MIN_BYTES", "1024"))
+
 app = FastAPI(
     title="Indian Law AI Platform",
-    version="0.1.0"
+    version="0.1.0",
+    default_response_class=ORJSONResponse,
 )
 
+try:
+    # brotli for clients that accept br, gzip fallback for the rest
+    from brotli_asgi import BrotliMiddleware
+    app.add_middleware(BrotliMiddleware, minimum_size=COMPRESSION_MIN_BYTES)
+except ImportError:
+    from fastapi.middleware.gzip import GZipMiddleware
+    app.add_middleware(GZipMiddleware, minimum_size=COMPRESSION_MIN_BYTES)
+
 app.include_router(router)
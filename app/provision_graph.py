@@ -0,0 +1,186 @@
+import os
+import re
+import json
+import hashlib
+from array import array
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# Precomputed provision graph, built at ingest time (scripts/build_provision_graph.py):
+#   - old code -> new code mappings (IPC 420 -> BNS 318)
+#   - explicit "section N" cross-references parsed from chunk texts
+#   - chapter membership
+# Edges are held as CSR adjacency arrays so every lookup is a dict hit plus a slice.
+BASE_DIR = Path(__file__).parent.parent
+DEFAULT_GRAPH_PATH = BASE_DIR / "knowledge_base" / "BNS" / "v2024" / "provision_graph.json"
+GRAPH_PATH = os.getenv("PROVISION_GRAPH_PATH", str(DEFAULT_GRAPH_PATH))
+
+# "section 64", "sections 25, 26 and 27" (lower-case only: "Section 1" is a page header)
+_REF_LIST = re.compile(r"\bsections?\s+(\d{1,3}[A-Z]?(?:(?:\s*,\s*|\s+and\s+|\s+or\s+)\d{1,3}[A-Z]?)*)")
+_REF_NUMBER = re.compile(r"\d{1,3}[A-Z]?")
+# "... of the Dowry Prohibition Act" points at another statute
+_OTHER_ACT = re.compile(r"^\s*of\s+the\s+")
+_CHAPTER = re.compile(r"(?m)^\s*CHAPTER\s*([IVXLC]+)\s*$")
+_SECTION_START = re.compile(r"(?m)^\s*(\d{1,4})\.\s+")
+_SHORT_ACT = re.compile(r"\(([A-Z]+)\)")
+
+def node_key(act: str, section: str) -> str:
+    return f"{act}:{section}"
+
+def parse_references(text: str, own_section: str) -> List[str]:
+    refs: List[str] = []
+    for m in _REF_LIST.finditer(text):
+        if _OTHER_ACT.match(text[m.end():m.end() + 12]):
+            continue
+        for num in _REF_NUMBER.findall(m.group(1)):
+            if num != own_section and num not in refs:
+                refs.append(num)
+    return refs
+
+def parse_chapters(clean_text: str) -> Tuple[List[Dict[str, str]], Dict[str, int]]:
+    """Chapter list and section -> chapter index (first occurrence wins)."""
+    chapters: List[Dict[str, str]] = []
+    section_chapter: Dict[str, int] = {}
+    bounds = list(_CHAPTER.finditer(clean_text))
+    for i, m in enumerate(bounds):
+        end = bounds[i + 1].start() if i + 1 < len(bounds) else len(clean_text)
+        body = clean_text[m.end():end]
+        title = body.strip().split("\n", 1)[0].strip() if body.strip() else ""
+        chapters.append({"number": m.group(1), "title": title})
+        for s in _SECTION_START.finditer(body):
+            section_chapter.setdefault(s.group(1), i)
+    return chapters, section_chapter
+
+def _csr(rows: List[List[int]]) -> Tuple[List[int], List[int]]:
+    offsets, targets = [0], []
+    for row in rows:
+        targets.extend(row)
+        offsets.append(len(targets))
+    return offsets, targets
+
+def build_provision_graph(chunks: List[Dict[str, Any]], clean_text: str,
+                          old_code_mappings: Dict[str, Any],
+                          law_sections: Iterable[Dict[str, Any]] = (),
+                          corpus_version: str = "", mapping_version: str = "") -> Dict[str, Any]:
+    nodes: List[str] = []
+    index: Dict[str, int] = {}
+    texts: Dict[int, List[str]] = {}
+    for c in chunks:
+        key = node_key(c["act"], str(c["section"]))
+        if key not in index:
+            index[key] = len(nodes)
+            nodes.append(key)
+        texts.setdefault(index[key], []).append(c.get("text", ""))
+
+    # Cross-references stay within the same act
+    refs: List[List[int]] = []
+    for i, key in enumerate(nodes):
+        act, section = key.split(":", 1)
+        row = []
+        for num in parse_references("\n".join(texts[i]), section):
+            target = index.get(node_key(act, num))
+            if target is not None and target not in row:
+                row.append(target)
+        refs.append(row)
+
+    chapters, section_chapter = parse_chapters(clean_text)
+    chapter_of = [section_chapter.get(key.split(":", 1)[1], -1) for key in nodes]
+    members: List[List[int]] = [[] for _ in chapters]
+    for i, ch in enumerate(chapter_of):
+        if ch >= 0:
+            members[ch].append(i)
+
+    old_codes: Dict[str, List[int]] = {}
+    def add_old(old_key: str, new_key: str) -> None:
+        target = index.get(new_key)
+        if target is not None and target not in old_codes.setdefault(old_key, []):
+            old_codes[old_key].append(target)
+
+    for old_act, spec in (old_code_mappings or {}).items():
+        for old_sec, new_secs in (spec.get("sections") or {}).items():
+            for new_sec in new_secs:
+                add_old(node_key(old_act, str(old_sec)), node_key(spec["new_act"], str(new_sec)))
+
+    # app/data/laws.py: {"act": "... (BNS)", "replaces": "IPC Section 506"}
+    for law in law_sections:
+        replaces, short = law.get("replaces"), _SHORT_ACT.search(law.get("act", ""))
+        if not replaces or not short:
+            continue
+        m = re.match(r"\s*([A-Za-z]+)\s+Section\s+(\w+)", replaces)
+        if m:
+            add_old(node_key(m.group(1).upper(), m.group(2).upper()), node_key(short.group(1), str(law["section"])))
+    old_codes = {k: v for k, v in old_codes.items() if v}
+
+    ref_offsets, ref_targets = _csr(refs)
+    chapter_offsets, chapter_nodes = _csr(members)
+    data = {
+        "nodes": nodes,
+        "ref_offsets": ref_offsets,
+        "ref_targets": ref_targets,
+        "chapters": chapters,
+        "chapter_of": chapter_of,
+        "chapter_offsets": chapter_offsets,
+        "chapter_nodes": chapter_nodes,
+        "old_codes": old_codes,
+    }
+    # Old-code mappings and cross-references change retrieval without touching
+    # the corpus, so the graph content gets its own version for cache keys
+    digest = hashlib.sha256(json.dumps(data, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+    return {"corpus_version": corpus_version, "mapping_version": mapping_version,
+            "graph_version": digest, **data}
+
+
+class ProvisionGraph:
+    def __init__(self, data: Dict[str, Any]) -> None:
+        self.corpus_version: str = data.get("corpus_version", "")
+        self.mapping_version: str = data.get("mapping_version", "")
+        self.graph_version: str = data.get("graph_version", "")
+        self.nodes: List[str] = data["nodes"]
+        self.index: Dict[str, int] = {k: i for i, k in enumerate(self.nodes)}
+        self.ref_offsets = array("i", data["ref_offsets"])
+        self.ref_targets = array("i", data["ref_targets"])
+        self.chapters: List[Dict[str, str]] = data["chapters"]
+        self.chapter_of = array("i", data["chapter_of"])
+        self.chapter_offsets = array("i", data["chapter_offsets"])
+        self.chapter_nodes = array("i", data["chapter_nodes"])
+        self.old_codes: Dict[str, List[int]] = data["old_codes"]
+
+    @classmethod
+    def load(cls, path: str = GRAPH_PATH) -> "ProvisionGraph":
+        return cls(json.loads(Path(path).read_text(encoding="utf-8")))
+
+    def _split(self, i: int) -> Tuple[str, str]:
+        act, section = self.nodes[i].split(":", 1)
+        return act, section
+
+    def resolve_old(self, old_act: str, old_section: str) -> List[Tuple[str, str]]:
+        """New-code (act, section) pairs for an old-code citation such as ("IPC", "420")."""
+        return [self._split(i) for i in self.old_codes.get(node_key(old_act.upper(), old_section.upper()), [])]
+
+    def references(self, act: str, section: str) -> List[Tuple[str, str]]:
+        i = self.index.get(node_key(act, section))
+        if i is None:
+            return []
+        return [self._split(t) for t in self.ref_targets[self.ref_offsets[i]:self.ref_offsets[i + 1]]]
+
+    def chapter(self, act: str, section: str) -> Optional[Dict[str, Any]]:
+        i = self.index.get(node_key(act, section))
+        if i is None or self.chapter_of[i] < 0:
+            return None
+        ch = self.chapter_of[i]
+        members = self.chapter_nodes[self.chapter_offsets[ch]:self.chapter_offsets[ch + 1]]
+        return {**self.chapters[ch], "sections": [self._split(t)[1] for t in members]}
+
+
+_graph = None
+_graph_missing = False
+
+def get_provision_graph() -> Optional[ProvisionGraph]:
+    global _graph, _graph_missing
+    if _graph is None and not _graph_missing:
+        try:
+            _graph = ProvisionGraph.load(GRAPH_PATH)
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Provision graph unavailable, old-code citations and cross-references disabled: {e}")
+            _graph_missing = True
+    return _graph
@@ -0,0 +1,162 @@
+import os
+import json
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+import numpy as np
+from .chroma_store import CHROMA_PATH, COLLECTION_NAME, get_collection, get_embedding_function
+
+# First-pass search over int8 / binary-quantized embeddings, then full-precision
+# rescoring of a shortlist. Built offline by scripts/quantize_index.py.
+INDEX_QUANTIZATION = os.getenv("INDEX_QUANTIZATION", "none").lower()  # none | int8 | binary
+DEFAULT_INDEX_DIR = Path(CHROMA_PATH) / f"{COLLECTION_NAME}_quantized"
+QUANTIZED_INDEX_DIR = os.getenv("QUANTIZED_INDEX_DIR", str(DEFAULT_INDEX_DIR))
+RESCORE_K = int(os.getenv("QUANTIZED_RESCORE_K", "100"))
+
+# Bits set per byte value, for Hamming distance over packed sign bits
+_POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+def _normalize(m: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(m, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return (m / norms).astype(np.float32)
+
+def quantize_int8(m: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    # Symmetric per-vector scaling; returns codes and the scale to undo it
+    scale = np.abs(m).max(axis=-1, keepdims=True)
+    scale[scale == 0] = 1.0
+    codes = np.round(m / scale * 127.0).astype(np.int8)
+    return codes, (scale[..., 0] / 127.0).astype(np.float32)
+
+def quantize_binary(m: np.ndarray) -> np.ndarray:
+    return np.packbits(m > 0, axis=-1)
+
+
+class QuantizedIndex:
+    def __init__(self, directory: str = QUANTIZED_INDEX_DIR, mode: str = INDEX_QUANTIZATION) -> None:
+        if mode not in ("int8", "binary"):
+            raise ValueError(f"Unsupported quantization mode: {mode}")
+        d = Path(directory)
+        meta = json.loads((d / "index.json").read_text(encoding="utf-8"))
+        self.mode = mode
+        self.ids: List[str] = meta["ids"]
+        self.acts = np.array(meta["acts"])
+        self.corpus_version: str = meta.get("corpus_version", "")
+        # Full-precision vectors stay on disk and are paged in only for the shortlist
+        self.vectors = np.load(d / "vectors_f32.npy", mmap_mode="r")
+        if mode == "int8":
+            self.codes = np.load(d / "int8.npy")
+            self.scales = np.load(d / "int8_scale.npy")
+        else:
+            self.codes = np.load(d / "binary.npy")
+
+    @staticmethod
+    def build(collection, directory: str = QUANTIZED_INDEX_DIR, corpus_version: str = "") -> Dict[str, Any]:
+        res = collection.get(include=["embeddings", "metadatas"])
+        ids = list(res["ids"])
+        metas = res.get("metadatas") or [{}] * len(ids)
+        vectors = _normalize(np.asarray(res["embeddings"], dtype=np.float32))
+        codes, scales = quantize_int8(vectors)
+        bits = quantize_binary(vectors)
+
+        d = Path(directory)
+        d.mkdir(parents=True, exist_ok=True)
+        np.save(d / "vectors_f32.npy", vectors)
+        np.save(d / "int8.npy", codes)
+        np.save(d / "int8_scale.npy", scales)
+        np.save(d / "binary.npy", bits)
+        (d / "index.json").write_text(json.dumps({
+            "ids": ids,
+            "acts": [(m or {}).get("act") or (m or {}).get("law") or "Unknown" for m in metas],
+            "corpus_version": corpus_version,
+        }), encoding="utf-8")
+
+        return {
+            "count": len(ids),
+            "dims": int(vectors.shape[1]) if len(ids) else 0,
+            "float32_bytes": int(vectors.nbytes),
+            "int8_bytes": int(codes.nbytes + scales.nbytes),
+            "binary_bytes": int(bits.nbytes),
+        }
+
+    def _mask(self, act: Optional[str]) -> Optional[np.ndarray]:
+        return None if not act else (self.acts == act)
+
+    def first_pass(self, qvec: np.ndarray, k: int, act: Optional[str] = None) -> np.ndarray:
+        """Indices of the k best candidates under the quantized metric."""
+        if self.mode == "int8":
+            qcodes, _ = quantize_int8(qvec)
+            # int8 dot product accumulated in int32, rescaled per document
+            scores = np.einsum("ij,j->i", self.codes, qcodes, dtype=np.int32).astype(np.float32) * self.scales
+        else:
+            qbits = quantize_binary(qvec)
+            # Higher is better: negate Hamming distance
+            scores = -_POPCOUNT[np.bitwise_xor(self.codes, qbits)].sum(axis=1, dtype=np.int32).astype(np.float32)
+
+        mask = self._mask(act)
+        if mask is not None:
+            scores = np.where(mask, scores, -np.inf)
+        k = min(k, len(scores))
+        if k <= 0:
+            return np.empty(0, dtype=np.int64)
+        top = np.argpartition(-scores, k - 1)[:k]
+        return top[np.isfinite(scores[top])]
+
+    def search(self, qvec: np.ndarray, n_results: int, act: Optional[str] = None,
+               rescore_k: int = RESCORE_K) -> Tuple[List[int], List[float]]:
+        qvec = _normalize(np.asarray(qvec, dtype=np.float32))
+        shortlist = self.first_pass(qvec, max(rescore_k, n_results), act)
+        if len(shortlist) == 0:
+            return [], []
+        shortlist = np.sort(shortlist)  # sequential reads from the memory map
+        sims = np.asarray(self.vectors[shortlist]) @ qvec
+        order = np.argsort(-sims)[:n_results]
+        return shortlist[order].tolist(), sims[order].tolist()
+
+    def exact_search(self, qvec: np.ndarray, n_results: int, act: Optional[str] = None) -> List[int]:
+        # Brute-force full-precision reference, used for recall measurement
+        qvec = _normalize(np.asarray(qvec, dtype=np.float32))
+        sims = np.asarray(self.vectors) @ qvec
+        mask = self._mask(act)
+        if mask is not None:
+            sims = np.where(mask, sims, -np.inf)
+        return np.argsort(-sims)[:n_results].tolist()
+
+    def query(self, query_text: str, n_results: int, act: Optional[str] = None) -> Dict[str, Any]:
+        """Same result shape as collection.query for a single query text."""
+        qvec = get_embedding_function()([query_text])[0]
+        idx, sims = self.search(qvec, n_results, act)
+        if not idx:
+            return {"ids": [[]], "documents": [[]], "metadatas": [[]], "distances": [[]]}
+
+        ids = [self.ids[i] for i in idx]
+        res = get_collection().get(ids=ids, include=["documents", "metadatas"])
+        by_id = {i: (doc, meta) for i, doc, meta in zip(res["ids"], res["documents"], res["metadatas"])}
+        kept = [(i, s) for i, s in zip(ids, sims) if i in by_id]
+        return {
+            "ids": [[i for i, _ in kept]],
+            "documents": [[by_id[i][0] for i, _ in kept]],
+            "metadatas": [[by_id[i][1] for i, _ in kept]],
+            # cosine distance, matching the collection's hnsw:space
+            "distances": [[1.0 - float(s) for _, s in kept]],
+        }
+
+
+_index = None
+_index_unavailable = False
+
+def get_quantized_index(corpus_version: Optional[str] = None) -> Optional[QuantizedIndex]:
+    global _index, _index_unavailable
+    if INDEX_QUANTIZATION == "none" or _index_unavailable:
+        return None
+    if _index is None:
+        try:
+            _index = QuantizedIndex(QUANTIZED_INDEX_DIR, INDEX_QUANTIZATION)
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Quantized index unavailable, using Chroma search: {e}")
+            _index_unavailable = True
+            return None
+        if corpus_version and _index.corpus_version and _index.corpus_version != corpus_version:
+            print("Quantized index is stale (corpus changed), using Chroma search. "
+                  "Re-run scripts/quantize_index.py.")
+            _index, _index_unavailable = None, True
+    return _index
@@ -0,0 +1,10 @@
+from abc import ABC, abstractmethod
+from typing import List, Optional
+
+class BaseReranker(ABC):
+    name = "base"
+
+    @abstractmethod
+    def rerank(self, query: str, texts: List[str], budget_seconds: float) -> Optional[List[float]]:
+        """Relevance score in [0, 1] per text, or None to fall back to the heuristic rerank."""
+        raise NotImplementedError
@@ -0,0 +1,34 @@
+import os
+import math
+import time
+from typing import List, Optional
+from .base import BaseReranker
+
+class CrossEncoderReranker(BaseReranker):
+    """Small local cross-encoder scored on CPU in batches under a per-request time budget."""
+
+    name = "cross_encoder"
+
+    def __init__(self) -> None:
+        from sentence_transformers import CrossEncoder  # optional, heavy (torch)
+        import torch
+
+        # Bound CPU use per worker process
+        torch.set_num_threads(int(os.getenv("RERANKER_THREADS", "2")))
+        self.model_name = os.getenv("RERANKER_MODEL", "cross-encoder/ms-marco-MiniLM-L-6-v2")
+        self.batch_size = int(os.getenv("RERANKER_BATCH_SIZE", "8"))
+        self.max_chars = int(os.getenv("RERANKER_MAX_CHARS", "2000"))
+        self.model = CrossEncoder(self.model_name, device="cpu", max_length=512)
+        self.name = f"cross_encoder:{self.model_name}"
+
+    def rerank(self, query: str, texts: List[str], budget_seconds: float) -> Optional[List[float]]:
+        deadline = time.perf_counter() + budget_seconds
+        scores: List[float] = []
+        for i in range(0, len(texts), self.batch_size):
+            pairs = [(query, t[:self.max_chars]) for t in texts[i:i + self.batch_size]]
+            logits = self.model.predict(pairs, batch_size=self.batch_size, show_progress_bar=False)
+            scores.extend(1.0 / (1.0 + math.exp(-float(x))) for x in logits)
+            # Checked between batches, so overrun is bounded by one batch
+            if time.perf_counter() > deadline and len(scores) < len(texts):
+                return None
+        return scores
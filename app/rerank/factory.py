@@ -0,0 +1,23 @@
+import os
+from typing import Optional
+from .base import BaseReranker
+
+# RERANKER: heuristic (default, lexical blend in retrieval_service) | cross_encoder
+RERANKER = os.getenv("RERANKER", "heuristic").lower()
+
+_reranker = None
+_reranker_failed = False
+
+def get_reranker() -> Optional[BaseReranker]:
+    global _reranker, _reranker_failed
+    if RERANKER != "cross_encoder" or _reranker_failed:
+        return None
+    if _reranker is None:
+        try:
+            from .cross_encoder import CrossEncoderReranker
+            _reranker = CrossEncoderReranker()
+        except Exception as e:
+            print(f"Reranker '{RERANKER}' unavailable, using heuristic rerank: {e}")
+            _reranker_failed = True
+            return None
+    return _reranker
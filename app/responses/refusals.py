@@ -4,3 +4,4 @@ OUTDATED_DATA = "Law found, but amendment status is uncertain."
 NON_LEGAL_QUERY = "This query does not appear to be related to Indian law."
 UNDERSPECIFIED_QUERY = "Please provide more specific legal details or keywords (e.g., 'section', 'act', 'crime')."
 MODEL_EMPTY_RESPONSE = "The model could not generate a response based on the provided information."
+DEGRADED_RETRIEVAL_ONLY = "The service is under heavy load. The relevant legal provisions are returned without a synthesized answer."
@@ -1,9 +1,16 @@
+import os
+import sqlite3
+import threading
 from pathlib import Path
-from app.services.retrieval_service import retrieve_sections
+from app.services.retrieval_service import retrieve_sections, is_provisional, _intent_type, _extract_section_number, _retrieval_cache_version
+from app.services.answer_store import get_answer_store, corpus_version, content_hash
 from schemas.response import AskResponse, Citation, Proof, ProofSource
-from app.responses.refusals import NO_LAW_FOUND, NON_LEGAL_QUERY, UNDERSPECIFIED_QUERY, MODEL_EMPTY_RESPONSE
+from app.responses.refusals import NO_LAW_FOUND, NON_LEGAL_QUERY, UNDERSPECIFIED_QUERY, MODEL_EMPTY_RESPONSE, DEGRADED_RETRIEVAL_ONLY
 from app.llm.factory import get_llm
-from typing import List, Dict, Any
+from app.cache.factory import cached, peek
+from app.cache.serialization import dump_response, load_response
+from app.core.trace import stage, note_cache, annotate
+from typing import List, Dict, Any, Optional
 
 # Helper to robustly access document text
 def doc_text(doc: Dict[str, Any]) -> str:
@@ -20,6 +27,28 @@ NON_LEGAL_KEYWORDS = [
 
 MAX_CONTEXT_CHARS = 6000
 
+class RequestCancelled(Exception):
+    """Raised when the caller gave up (e.g. client disconnected) before the LLM call."""
+
+PROMPT_TEMPLATE_PATH = Path(__file__).parent.parent / "prompts" / "legal_synthesis.txt"
+
+_prompt_template = None
+
+def load_prompt_template() -> str:
+    global _prompt_template
+    if _prompt_template is None:
+        with open(PROMPT_TEMPLATE_PATH, "r") as f:
+            _prompt_template = f.read()
+    return _prompt_template
+
+def prompt_hash() -> str:
+    return content_hash(load_prompt_template())
+
+def model_id() -> str:
+    # The LLM that writes answers; stored and cached answers are only valid for it
+    provider = os.getenv("LLM_PROVIDER", "local").lower()
+    return f"{provider}:{os.getenv('GEMINI_MODEL', '')}"
+
 def classify_intent(query: str) -> str:
     """
     Classifies the query intent into one of three states.
@@ -60,16 +89,88 @@ def calculate_confidence(docs: List[Dict[str, Any]]) -> float:
     return max(0.0, min(score, 0.9))
 
 
-def get_answer(query: str) -> AskResponse:
+def _lookup_precomputed(query: str) -> Optional[AskResponse]:
+    # Section lookups are deterministic, so their answers are built offline
+    if _intent_type(query) != "section_lookup":
+        return None
+    sec = _extract_section_number(query)
+    store = get_answer_store()
+    if not sec or store is None:
+        return None
+    try:
+        with stage("answer_store"):
+            raw = store.lookup(sec, corpus_version(), prompt_hash(), model_id())
+    except sqlite3.Error as e:
+        # e.g. locked while precompute_answers.py writes; the live pipeline answers instead
+        print(f"Answer store lookup failed, answering live: {e}")
+        return None
+    note_cache("answer_store", hit=raw is not None)
+    if raw is None:
+        return None
+    return AskResponse.model_validate_json(raw)
+
+
+def _check_cancelled(cancel_event: Optional[threading.Event]) -> None:
+    if cancel_event is not None and cancel_event.is_set():
+        raise RequestCancelled()
+
+
+def get_answer(query: str, synthesize: bool = True,
+               cancel_event: Optional[threading.Event] = None) -> AskResponse:
     # 0. Intent Classification Gate
     intent = classify_intent(query)
+    annotate(intent=intent)
     if intent == "non_legal":
         return AskResponse(answer=NON_LEGAL_QUERY, citations=[], confidence=0.0, proof=None)
     if intent == "underspecified_legal":
         return AskResponse(answer=UNDERSPECIFIED_QUERY, citations=[], confidence=0.0, proof=None)
 
+    # 0b. Precomputed section answers (no retrieval, no LLM)
+    precomputed = _lookup_precomputed(query)
+    if precomputed is not None:
+        return precomputed
+
+    # 0c. Shared answer cache (keyed on corpus, retrieval settings, prompt and model)
+    normalized = " ".join(query.split())
+    if not synthesize:
+        # Degraded mode: reuse a full cached answer if there is one, but never
+        # store the retrieval-only response in its place
+        hit = peek("answer", _answer_cache_version(), normalized, load_response)
+        if hit is not None:
+            return hit
+        return _answer_uncached(normalized, synthesize=False, cancel_event=cancel_event)
+
+    provisional = []
+    return cached(
+        "answer", _answer_cache_version(), normalized,
+        lambda: _answer_uncached(normalized, cancel_event=cancel_event, provisional=provisional),
+        dumps=dump_response, loads=load_response,
+        # Refusals may come from an unreachable collection, not from the query;
+        # like empty retrievals and reranker fallbacks they are never pinned
+        cacheable=lambda r: (not provisional and r.answer not in (MODEL_EMPTY_RESPONSE, NO_LAW_FOUND)
+                             and r.confidence >= 0.3),
+    )
+
+
+def _answer_cache_version() -> str:
+    # Retrieval settings (reranker, quantization, K values) change the context, so they key answers too
+    return f"{_retrieval_cache_version()}:{prompt_hash()}:{model_id()}"
+
+
+def _answer_uncached(query: str, synthesize: bool = True,
+                     cancel_event: Optional[threading.Event] = None,
+                     provisional: Optional[List[bool]] = None) -> AskResponse:
     # 1. Retrieve Docs
-    retrieved_docs = retrieve_sections(query)
+    _check_cancelled(cancel_event)
+    with stage("retrieval"):
+        retrieved_docs = retrieve_sections(query)
+    if provisional is not None and is_provisional(retrieved_docs):
+        provisional.append(True)
+    return answer_from_docs(query, retrieved_docs, synthesize=synthesize, cancel_event=cancel_event)
+
+
+def answer_from_docs(query: str, retrieved_docs: List[Dict[str, Any]], synthesize: bool = True,
+                     cancel_event: Optional[threading.Event] = None) -> AskResponse:
     if not retrieved_docs:
         return AskResponse(answer=NO_LAW_FOUND, citations=[], confidence=0.0, proof=None)
 
@@ -105,6 +206,15 @@ def get_answer(query: str) -> AskResponse:
         reasoning="The answer is synthesized from the retrieved legal provisions."
     )
 
+    # Under load: retrieval-only response, proof intact, no LLM call
+    if not synthesize:
+        return AskResponse(
+            answer=DEGRADED_RETRIEVAL_ONLY,
+            citations=citations,
+            confidence=confidence,
+            proof=proof
+        )
+
     # 4. Synthesize Answer
     context = "\n\n---\n\n".join([doc_text(doc) for doc in retrieved_docs])
     
@@ -115,14 +225,12 @@ def get_answer(query: str) -> AskResponse:
     if not context.strip():
         return AskResponse(answer=NO_LAW_FOUND, citations=[], confidence=0.0, proof=None)
     
-    prompt_template_path = Path(__file__).parent.parent / "prompts" / "legal_synthesis.txt"
-    with open(prompt_template_path, "r") as f:
-        prompt_template = f.read()
-    
-    prompt = prompt_template.replace("{{context}}", context).replace("{{query}}", query)
+    prompt = load_prompt_template().replace("{{context}}", context).replace("{{query}}", query)
     
+    _check_cancelled(cancel_event)
     llm = get_llm()
-    answer = llm.generate(prompt)
+    with stage("llm"):
+        answer = llm.generate(prompt)
 
     # Handle LLM failure but preserve proof
     if not answer or not answer.strip():
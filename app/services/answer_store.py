@@ -0,0 +1,118 @@
+import os
+import hashlib
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Optional, List, Tuple
+
+# Precomputed answers for deterministic section lookups.
+# Filled offline by scripts/precompute_answers.py after ingestion and read by
+# get_answer so that "section N" queries never reach the LLM.
+BASE_DIR = Path(__file__).parent.parent.parent
+DEFAULT_STORE_PATH = BASE_DIR / "answer_store.sqlite"
+STORE_PATH = os.getenv("ANSWER_STORE_PATH", str(DEFAULT_STORE_PATH))
+DEFAULT_CORPUS_PATH = BASE_DIR / "knowledge_base" / "BNS" / "v2024" / "bns_chunks.json"
+CORPUS_PATH = os.getenv("ANSWER_STORE_CORPUS_PATH", str(DEFAULT_CORPUS_PATH))
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS answers (
+    act TEXT NOT NULL,
+    section TEXT NOT NULL,
+    corpus_version TEXT NOT NULL,
+    prompt_hash TEXT NOT NULL,
+    model TEXT NOT NULL,
+    response TEXT NOT NULL,
+    created_at TEXT NOT NULL DEFAULT (datetime('now')),
+    PRIMARY KEY (section, act, corpus_version, prompt_hash, model)
+)
+"""
+
+def content_hash(data) -> str:
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    return hashlib.sha256(data).hexdigest()[:16]
+
+_corpus_version = None
+
+def corpus_version() -> str:
+    # Explicit override wins (e.g. when the corpus is ingested from elsewhere)
+    global _corpus_version
+    if _corpus_version is None:
+        override = os.getenv("CORPUS_VERSION")
+        if override:
+            _corpus_version = override
+        else:
+            path = Path(CORPUS_PATH)
+            _corpus_version = content_hash(path.read_bytes()) if path.exists() else "unknown"
+    return _corpus_version
+
+
+class AnswerStore:
+    """SQLite-backed key-value store of serialized AskResponse JSON per (act, section)."""
+
+    def __init__(self, path: str = STORE_PATH, readonly: bool = True):
+        self.path = path
+        self.readonly = readonly
+        self._lock = threading.Lock()
+        if readonly:
+            uri = f"file:{Path(path).as_posix()}?mode=ro"
+            # Short busy timeout: a locked store falls back to the live pipeline quickly
+            self._conn = sqlite3.connect(uri, uri=True, check_same_thread=False, timeout=0.5)
+        else:
+            self._conn = sqlite3.connect(path, check_same_thread=False)
+            self._conn.execute(_SCHEMA)
+            self._conn.commit()
+
+    def lookup(self, section: str, corpus_version: str, prompt_hash: str, model: str,
+               act: Optional[str] = None) -> Optional[str]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT act, response FROM answers "
+                "WHERE section = ? AND corpus_version = ? AND prompt_hash = ? AND model = ?",
+                (str(section), corpus_version, prompt_hash, model),
+            ).fetchall()
+        if act is not None:
+            rows = [r for r in rows if r[0] == act]
+        # Ambiguous across acts: let the live pipeline decide
+        if len(rows) != 1:
+            return None
+        return rows[0][1]
+
+    def put_many(self, rows: List[Tuple[str, str, str, str, str, str]]) -> None:
+        # rows: (act, section, corpus_version, prompt_hash, model, response_json)
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO answers "
+                "(act, section, corpus_version, prompt_hash, model, response) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            self._conn.commit()
+
+    def prune(self, corpus_version: str, prompt_hash: str, model: str) -> int:
+        # Drop entries from older corpus / prompt versions and other models
+        with self._lock:
+            cur = self._conn.execute(
+                "DELETE FROM answers WHERE corpus_version != ? OR prompt_hash != ? OR model != ?",
+                (corpus_version, prompt_hash, model),
+            )
+            self._conn.commit()
+            return cur.rowcount
+
+
+_store = None
+_store_missing = False
+
+def get_answer_store() -> Optional[AnswerStore]:
+    global _store, _store_missing
+    if _store is not None or _store_missing:
+        return _store
+    if os.getenv("ANSWER_STORE_ENABLED", "1") == "0" or not Path(STORE_PATH).exists():
+        _store_missing = True
+        return None
+    try:
+        _store = AnswerStore(STORE_PATH, readonly=True)
+    except sqlite3.Error as e:
+        print(f"Answer store unavailable at {STORE_PATH}: {e}")
+        _store_missing = True
+    return _store
@@ -1,11 +1,36 @@
+import os
 import re
-from typing import List, Dict, Any, Optional
-from app.chroma_store import get_collection
+from typing import List, Dict, Any, Optional, Tuple
+from app.chroma_store import get_collection, COLLECTION_NAME
+from app.services.answer_store import corpus_version
+from app.cache.factory import cached
+from app.cache.serialization import dump_json, load_json
+from app.rerank.factory import get_reranker
+from app.provision_graph import get_provision_graph
+from app.core.trace import stage, annotate
 
 # Retrieval tuning
 CANDIDATES_K = 25          # high recall
-FINAL_K = 5                # what you return
+FINAL_K = int(os.getenv("RETRIEVAL_FINAL_K", "5"))  # what you return
 SIMILARITY_THRESHOLD = 0.35  # lower than before; we rerank + gate later
+INDEX_QUANTIZATION = os.getenv("INDEX_QUANTIZATION", "none").lower()  # none | int8 | binary
+RERANK_TOP_N = int(os.getenv("RERANKER_TOP_N", "20"))  # candidates the model reranker sees
+RERANK_BUDGET_SECONDS = float(os.getenv("RERANKER_BUDGET_MS", "150")) / 1000.0
+TAIL_SCALE = 0.9  # candidates past RERANK_TOP_N score at most this fraction of the lowest model score
+MAX_REFERENCE_EXPANSION = int(os.getenv("RETRIEVAL_MAX_REFERENCES", "2"))  # cross-referenced sections pulled in
+REFERENCE_SCORE = 0.5  # relevance_score for sections pulled in via cross-references
+CHUNK_FANOUT = int(os.getenv("RETRIEVAL_CHUNK_FANOUT", "3"))  # sub-section chunks fetched per wanted section
+SIBLING_BONUS = 0.03       # relative boost per extra matching chunk of the same section
+MAX_SIBLING_BONUS = 0.06
+
+# Old-code citations: "IPC 420", "section 498A of the Indian Penal Code", "420 IPC"
+OLD_CODE_NAMES = {"ipc": "IPC", "indian penal code": "IPC", "crpc": "CRPC"}
+_OLD_CODE = r"(ipc|crpc|indian penal code)"
+OLD_CODE_PATTERNS = [
+    re.compile(rf"\b{_OLD_CODE}\s*(?:section|sec\.?|s\.)?\s*(\d{{1,3}}[a-z]?)\b"),
+    re.compile(rf"\b(?:section|sec\.?)\s*(\d{{1,3}}[a-z]?)\s+(?:of\s+)?(?:the\s+)?{_OLD_CODE}\b"),
+    re.compile(rf"\b(\d{{1,3}}[a-z]?)\s+{_OLD_CODE}\b"),
+]
 
 PUNISHMENT_ANCHORS = [
     "shall be punished", "punished with", "imprisonment", "fine", "death",
@@ -33,11 +58,25 @@ def _normalize_meta(meta: dict) -> dict:
         "effective_from": effective_from,
         "version": version,
         "type": meta.get("type", "bare_act"),
+        # Sub-section chunks point at their section; older collections hold one chunk per section
+        "parent_id": meta.get("parent_id") or f"{act}:{section}",
+        "ordinal": int(meta.get("ordinal") or 0),
+        "header": meta.get("header") or "",
     }
 
+def _extract_old_code_citation(query: str) -> Optional[Tuple[str, str]]:
+    q = query.lower()
+    for i, pattern in enumerate(OLD_CODE_PATTERNS):
+        m = pattern.search(q)
+        if m:
+            code, sec = (m.group(1), m.group(2)) if i == 0 else (m.group(2), m.group(1))
+            return OLD_CODE_NAMES[code], sec.upper()
+    return None
+
 def _intent_type(query: str) -> str:
     q = query.lower()
-    if re.search(r"\bsection\s+\d{1,4}\b", q):
+    # "section 420 of IPC" is not a lookup of section 420 in the new code
+    if re.search(r"\bsection\s+\d{1,4}\b", q) and not _extract_old_code_citation(query):
         return "section_lookup"
     if any(k in q for k in ["punishment", "penalty", "sentence", "imprisonment", "fine", "death"]):
         return "punishment"
@@ -71,6 +110,95 @@ def _final_score(similarity: float, text: str, intent: str, keywords: List[str])
         return 0.55 * similarity + 0.30 * _anchor_score(text, PUNISHMENT_ANCHORS) + 0.15 * _keyword_score(text, keywords)
     return 0.80 * similarity + 0.20 * _keyword_score(text, keywords)
 
+def _model_rerank(query: str, candidates: List[Tuple[float, float, str, dict]]
+                  ) -> Tuple[List[Tuple[float, float, str, dict]], bool]:
+    # Optional second stage: a local model re-scores the heuristic top-N.
+    # On budget overrun or any failure the heuristic order stands for this
+    # request only; the returned flag tells the caller not to cache it.
+    reranker = get_reranker()
+    if reranker is None or len(candidates) < 2:
+        return candidates, False
+    head, tail = candidates[:RERANK_TOP_N], candidates[RERANK_TOP_N:]
+    try:
+        scores = reranker.rerank(query, [c[2] for c in head], RERANK_BUDGET_SECONDS)
+    except Exception as e:
+        print(f"Reranker error, using heuristic rerank: {e}")
+        return candidates, True
+    if scores is None:
+        return candidates, True
+    reranked = [(s, sim, doc_text, meta) for s, (_, sim, doc_text, meta) in zip(scores, head)]
+    reranked.sort(key=lambda x: x[0], reverse=True)
+    if not tail:
+        return reranked, False
+    # Heuristic tail scores are on another scale: squeeze them under the lowest
+    # model score (keeping their order) so later re-sorts cannot lift them above
+    # the reranked head, even with the per-section sibling bonus
+    floor = reranked[-1][0] * TAIL_SCALE
+    tail_max = max(t[0] for t in tail) or 1.0
+    return reranked + [(floor * score / tail_max, sim, doc_text, meta) for score, sim, doc_text, meta in tail], False
+
+def _join_chunks(parts: List[Tuple[int, str]]) -> str:
+    # Chunks in reading order; skipped clauses are marked so the text does not read as continuous
+    parts = sorted(parts, key=lambda p: p[0])
+    out = parts[0][1]
+    for (prev, _), (ordinal, text) in zip(parts, parts[1:]):
+        out += ("\n" if ordinal == prev + 1 else "\n...\n") + text
+    return out
+
+def _aggregate_by_parent(candidates: List[Tuple[float, float, str, dict]],
+                         extra_chunks: Optional[Dict[Tuple[str, str], List[Tuple[int, str]]]] = None
+                         ) -> List[Tuple[float, float, str, dict]]:
+    """
+    Collapse sub-section chunk candidates into one candidate per section: the
+    best chunk's score raised a few percent for each further matching chunk, and
+    the section header followed by only the matching chunks as text.
+    extra_chunks ((act, parent_id) -> [(ordinal, text)]) are added to the text
+    without affecting the score.
+    """
+    groups: Dict[Tuple[str, str], List[Tuple[float, float, str, dict]]] = {}
+    for cand in candidates:
+        nm = _normalize_meta(cand[3] or {})
+        groups.setdefault((nm["act"], nm["parent_id"]), []).append(cand)
+
+    aggregated = []
+    for key, chunks in groups.items():
+        best = max(chunks, key=lambda c: c[0])
+        score = best[0] * (1.0 + min(MAX_SIBLING_BONUS, SIBLING_BONUS * (len(chunks) - 1)))
+        sim = max(c[1] for c in chunks)
+        parts = {_normalize_meta(c[3] or {})["ordinal"]: c[2] for c in chunks}
+        for ordinal, chunk_text in (extra_chunks or {}).get(key, []):
+            parts.setdefault(ordinal, chunk_text)
+        text = _join_chunks(list(parts.items()))
+        header = _normalize_meta(best[3] or {})["header"]
+        if header:
+            text = f"{header}\n{text}"
+        aggregated.append((score, sim, text, best[3]))
+    aggregated.sort(key=lambda x: x[0], reverse=True)
+    return aggregated
+
+def _punishment_chunks(collection, candidates: List[Tuple[float, float, str, dict]]
+                       ) -> Dict[Tuple[str, str], List[Tuple[int, str]]]:
+    """
+    Punishment-bearing chunks of the candidates' sections. In an offence section
+    the penalty is usually its own sub-section (e.g. 303(2)), which a query may
+    not match even when the definition does.
+    """
+    parent_ids = sorted({c[3]["parent_id"] for c in candidates if c[3] and c[3].get("parent_id")})
+    if not parent_ids:
+        return {}
+    where = {"parent_id": parent_ids[0]} if len(parent_ids) == 1 else {"parent_id": {"$in": parent_ids}}
+    try:
+        res = collection.get(where=where, include=["documents", "metadatas"])
+    except Exception as e:
+        print(f"Error fetching punishment clauses: {e}")
+        return {}
+    out: Dict[Tuple[str, str], List[Tuple[int, str]]] = {}
+    for doc_text, meta in zip(res.get("documents") or [], res.get("metadatas") or []):
+        if _anchor_score(doc_text, PUNISHMENT_ANCHORS) > 0:
+            nm = _normalize_meta(meta or {})
+            out.setdefault((nm["act"], nm["parent_id"]), []).append((nm["ordinal"], doc_text))
+    return out
+
 def _format_matches(docs: List[str], metas: List[dict], sims: List[float]) -> List[Dict[str, Any]]:
     matches = []
     for doc_text, meta, sim in zip(docs, metas, sims):
@@ -87,7 +215,130 @@ def _format_matches(docs: List[str], metas: List[dict], sims: List[float]) -> Li
         })
     return matches
 
+def highlight_spans(text: str, query: str) -> List[Tuple[int, int]]:
+    # Character spans of query keywords (and punishment anchors for punishment
+    # queries) in text, merged and sorted, for client-side highlighting
+    terms = _extract_target_keywords(query)
+    if _intent_type(query) == "punishment":
+        terms = terms + PUNISHMENT_ANCHORS
+    if not terms:
+        return []
+    pattern = re.compile("|".join(re.escape(t) for t in sorted(set(terms), key=len, reverse=True)), re.IGNORECASE)
+    spans: List[Tuple[int, int]] = []
+    for m in pattern.finditer(text):
+        if spans and m.start() <= spans[-1][1]:
+            spans[-1] = (spans[-1][0], max(spans[-1][1], m.end()))
+        else:
+            spans.append((m.start(), m.end()))
+    return spans
+
+def _quantized_index():
+    if INDEX_QUANTIZATION == "none":
+        return None
+    from app.quantized_index import get_quantized_index  # numpy only when enabled
+    return get_quantized_index(corpus_version())
+
+def _get_sections(collection, sections: List[str], act: Optional[str]) -> List[Dict[str, Any]]:
+    where = {"section": sections[0]} if len(sections) == 1 else {"section": {"$in": sections}}
+    if act:
+        where = {"$and": [where, {"act": act}]}
+    res = collection.get(where=where, include=["documents", "metadatas"])
+    if not res or not res.get("documents"):
+        return []
+
+    # Exact lookups return the whole section: every chunk of a parent, in order
+    parents: Dict[Tuple[str, str], Tuple[dict, List[Tuple[int, str]]]] = {}
+    for doc_text, meta in zip(res["documents"], res["metadatas"]):
+        nm = _normalize_meta(meta or {})
+        parents.setdefault((nm["act"], nm["parent_id"]), (meta, []))[1].append((nm["ordinal"], doc_text))
+
+    # Chroma returns rows in storage order; keep the requested order
+    def order(key):
+        section = _normalize_meta(parents[key][0] or {})["section"]
+        return (sections.index(section) if section in sections else len(sections), key[1])
+
+    keys = sorted(parents, key=order)
+    return _format_matches(
+        [_join_chunks(parents[k][1]) for k in keys],
+        [parents[k][0] for k in keys],
+        [0.99] * len(keys),
+    )
+
+def _lookup_sections(collection, sections: List[str], act: Optional[str], limit: int) -> List[Dict[str, Any]]:
+    """
+    Exact fetch of the given sections, followed by the sections they explicitly
+    cross-reference (from the provision graph) while there is room under limit.
+    """
+    out = _get_sections(collection, sections, act)
+    for m in out:
+        m["exact_match"] = True
+        m["score"] = m["relevance_score"]
+    out = out[:limit]
+
+    graph = get_provision_graph()
+    room = min(limit - len(out), MAX_REFERENCE_EXPANSION)
+    if not out or graph is None or room <= 0:
+        return out
+
+    seen = {(m["act"], m["section"]) for m in out}
+    refs: List[Tuple[str, str, str]] = []
+    for m in out:
+        for ref_act, ref_sec in graph.references(m["act"], m["section"]):
+            if (ref_act, ref_sec) not in seen and len(refs) < room:
+                seen.add((ref_act, ref_sec))
+                refs.append((ref_act, ref_sec, m["section"]))
+    if not refs:
+        return out
+
+    ref_from = {sec: src for _, sec, src in refs}
+    for m in _get_sections(collection, [sec for _, sec, _ in refs], refs[0][0])[:room]:
+        m["relevance_score"] = m["score"] = REFERENCE_SCORE
+        m["referenced_from"] = ref_from.get(m["section"])
+        out.append(m)
+    return out
+
+def _reranker_name() -> str:
+    # The reranker actually in use: a model that failed to load means heuristic
+    reranker = get_reranker()
+    return reranker.name if reranker is not None else "heuristic"
+
+def _graph_version() -> str:
+    graph = get_provision_graph()
+    if graph is None:
+        return "nograph"
+    # Graphs built before graph_version existed: fall back to the mapping hash
+    return graph.graph_version or graph.mapping_version or "unversioned"
+
+def _retrieval_cache_version() -> str:
+    # Results change with the corpus, the provision graph, the collection, the index and the tuning knobs
+    return (f"{corpus_version()}:{_graph_version()}:{COLLECTION_NAME}:{INDEX_QUANTIZATION}:{_reranker_name()}:{RERANK_TOP_N}:"
+            f"{CANDIDATES_K}:{FINAL_K}:{SIMILARITY_THRESHOLD}:{CHUNK_FANOUT}:{MAX_REFERENCE_EXPANSION}")
+
+def is_provisional(matches: List[Dict[str, Any]]) -> bool:
+    """True when the ranking is a fallback that must not be cached (or anything built from it)."""
+    return any(m.get("rerank_fallback") for m in matches)
+
 def retrieve_sections(query: str) -> List[Dict[str, Any]]:
+    return search_sections(query, limit=FINAL_K)
+
+def search_sections(query: str, limit: int = FINAL_K, act: Optional[str] = None) -> List[Dict[str, Any]]:
+    normalized = " ".join(query.split())
+    return cached(
+        "retrieval", _retrieval_cache_version(), f"{limit}|{act or ''}|{normalized}",
+        lambda: rank_sections(normalized, limit=limit, act=act),
+        dumps=dump_json, loads=load_json,
+        # [] is also returned when the collection is unreachable, and a reranker
+        # fallback is a per-request degradation; never pin either
+        cacheable=lambda matches: bool(matches) and not is_provisional(matches),
+    )
+
+def rank_sections(query: str, limit: int = FINAL_K, act: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    Ranked matches for a query: exact section lookup first, otherwise semantic
+    sub-section candidates reranked, aggregated per section and passed through
+    the punishment gate. Each match carries its rerank "score" next to the raw
+    "relevance_score" similarity.
+    """
     try:
         # Use the centralized collection accessor
         collection = get_collection()
@@ -96,26 +347,40 @@ def retrieve_sections(query: str) -> List[Dict[str, Any]]:
         return []
 
     intent = _intent_type(query)
+    annotate(retrieval_intent=intent)
+
+    # 0) Old-code citation resolved through the provision graph (no embeddings)
+    cited = _extract_old_code_citation(query)
+    graph = get_provision_graph()
+    if cited and graph is not None:
+        targets = [(a, sec) for a, sec in graph.resolve_old(*cited) if not act or a == act]
+        if targets:
+            out = _lookup_sections(collection, [sec for _, sec in targets], targets[0][0], limit)
+            for m in out:
+                if m["exact_match"]:
+                    m["replaces"] = f"{cited[0]} Section {cited[1]}"
+            if out:
+                return out
 
     # 1) Deterministic section lookup (no embeddings)
     if intent == "section_lookup":
         sec = _extract_section_number(query)
         if sec:
-            res = collection.get(
-                where={"section": str(sec)},
-                include=["documents", "metadatas"]
-            )
-            if res and res.get("documents"):
-                docs = res["documents"]
-                metas = res["metadatas"]
-                sims = [0.99] * len(docs)
-                out = _format_matches(docs, metas, sims)
-                for m in out:
-                    m["exact_match"] = True
-                return out[:FINAL_K]
-
-    # 2) High-recall semantic retrieval
-    results = collection.query(query_texts=[query], n_results=CANDIDATES_K)
+            out = _lookup_sections(collection, [str(sec)], act, limit)
+            if out:
+                return out
+
+    # 2) High-recall semantic retrieval over sub-section chunks; several chunks
+    # can belong to one section, so fetch CHUNK_FANOUT times the section-level pool
+    n_results = max(CANDIDATES_K, limit) * CHUNK_FANOUT
+    index = _quantized_index()
+    with stage("vector_search"):
+        if index is not None:
+            # Quantized first pass + full-precision rescoring, same result shape
+            results = index.query(query, n_results=n_results, act=act)
+        else:
+            query_kwargs = {"where": {"act": act}} if act else {}
+            results = collection.query(query_texts=[query], n_results=n_results, **query_kwargs)
 
     if not results or not results.get("documents") or not results["documents"][0]:
         return []
@@ -142,6 +407,13 @@ def retrieve_sections(query: str) -> List[Dict[str, Any]]:
 
     # 3) Rerank and answerability gate (prevents random punishment sections)
     candidates.sort(key=lambda x: x[0], reverse=True)
+    with stage("rerank"):
+        candidates, rerank_fallback = _model_rerank(query, candidates)
+    if rerank_fallback:
+        annotate(rerank_fallback=True)
+    # Punishment queries need the penalty text even when only the definition matched
+    extra = _punishment_chunks(collection, candidates) if intent == "punishment" else None
+    candidates = _aggregate_by_parent(candidates, extra)
 
     filtered = []
     if intent == "punishment":
@@ -155,10 +427,15 @@ def retrieve_sections(query: str) -> List[Dict[str, Any]]:
     else:
         filtered = candidates
 
-    top = filtered[:FINAL_K]
+    top = filtered[:limit]
     out = _format_matches(
         [t[2] for t in top],
         [t[3] for t in top],
         [t[1] for t in top],  # keep raw similarity in relevance_score
     )
+    for m, t in zip(out, top):
+        m["score"] = float(t[0])
+        if rerank_fallback:
+            # Heuristic order standing in for the model; see search_sections
+            m["rerank_fallback"] = True
     return out
@@ -0,0 +1,39 @@
+from app.services.retrieval_service import search_sections, highlight_spans
+from schemas.request import SearchRequest
+from schemas.response import SearchMatch, SearchResponse
+
+def search(request: SearchRequest) -> SearchResponse:
+    # Retrieval-only: same ranking and punishment gate as /ask, no prompt, no LLM.
+    # One extra match is fetched to tell whether another page exists.
+    ranked = search_sections(
+        request.query,
+        limit=request.offset + request.top_k + 1,
+        act=request.act,
+    )
+    page = ranked[request.offset:request.offset + request.top_k]
+
+    matches = [
+        SearchMatch(
+            act=m.get("act", "Unknown"),
+            section=m.get("section", "Unknown"),
+            title=m.get("title", "Unknown"),
+            effective_from=m.get("effective_from", "Unknown"),
+            text=m.get("text", ""),
+            score=m.get("score", m.get("relevance_score", 0.0)),
+            relevance_score=m.get("relevance_score", 0.0),
+            exact_match=m.get("exact_match", False),
+            highlights=(
+                [list(span) for span in highlight_spans(m.get("text", ""), request.query)]
+                if request.highlight else None
+            ),
+        )
+        for m in page
+    ]
+
+    return SearchResponse(
+        query=request.query,
+        matches=matches,
+        offset=request.offset,
+        top_k=request.top_k,
+        has_more=len(ranked) > request.offset + request.top_k,
+    )
@@ -1,4 +1,17 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
+from typing import List, Literal, Optional
+
+AskResponseField = Literal["answer", "citations", "confidence", "disclaimer", "proof"]
 
 class AskRequest(BaseModel):
     query: str
+    # Response shaping: subset of top-level fields and max chars per proof snippet
+    fields: Optional[List[AskResponseField]] = None
+    snippet_chars: Optional[int] = Field(default=None, ge=0)
+
+class SearchRequest(BaseModel):
+    query: str
+    top_k: int = Field(default=5, ge=1, le=50)
+    offset: int = Field(default=0, ge=0, le=200)
+    act: Optional[str] = None
+    highlight: bool = False
@@ -22,3 +22,21 @@ class AskResponse(BaseModel):
     confidence: float
     disclaimer: str = "This response is informational and not legal advice."
     proof: Optional[Proof] = None
+
+class SearchMatch(BaseModel):
+    act: str
+    section: str
+    title: str
+    effective_from: str
+    text: str
+    score: float
+    relevance_score: float
+    exact_match: bool = False
+    highlights: Optional[List[List[int]]] = None
+
+class SearchResponse(BaseModel):
+    query: str
+    matches: List[SearchMatch]
+    offset: int
+    top_k: int
+    has_more: bool
@@ -0,0 +1,42 @@
+import sys
+import json
+from pathlib import Path
+import yaml
+
+# Add project root to sys.path to allow imports from app
+BASE_DIR = Path(__file__).parent.parent
+sys.path.append(str(BASE_DIR))
+
+from app.provision_graph import build_provision_graph, GRAPH_PATH
+from app.data.laws import LAW_SECTIONS
+from app.services.answer_store import corpus_version, content_hash
+
+CHUNKS_FILE_PATH = BASE_DIR / "knowledge_base" / "BNS" / "v2024" / "bns_chunks.json"
+CLEAN_TEXT_PATH = BASE_DIR / "knowledge_base" / "BNS" / "v2024" / "bns_clean.txt"
+MAPPING_PATH = BASE_DIR / "config" / "ipc_bns_mapping.yaml"
+
+def build_graph():
+    if not CHUNKS_FILE_PATH.exists():
+        print(f"Error: Chunks file not found at {CHUNKS_FILE_PATH}")
+        return
+
+    chunks = json.loads(CHUNKS_FILE_PATH.read_text(encoding="utf-8"))
+    clean_text = CLEAN_TEXT_PATH.read_text(encoding="utf-8") if CLEAN_TEXT_PATH.exists() else ""
+    mapping_text = MAPPING_PATH.read_text(encoding="utf-8") if MAPPING_PATH.exists() else ""
+    mappings = yaml.safe_load(mapping_text) or {}
+
+    graph = build_provision_graph(chunks, clean_text, mappings, LAW_SECTIONS, corpus_version(),
+                                  content_hash(mapping_text))
+
+    print(f"Nodes:             {len(graph['nodes'])}")
+    print(f"Cross-references:  {len(graph['ref_targets'])}")
+    print(f"Chapters:          {len(graph['chapters'])}")
+    print(f"Old-code mappings: {len(graph['old_codes'])}")
+    print(f"Graph version:     {graph['graph_version']}")
+
+    with open(GRAPH_PATH, "w", encoding="utf-8") as f:
+        json.dump(graph, f, ensure_ascii=False, separators=(",", ":"))
+    print(f"Wrote: {GRAPH_PATH}")
+
+if __name__ == "__main__":
+    build_graph()
@@ -3,6 +3,60 @@ import re, json
 clean_path = "knowledge_base/BNS/v2024/bns_clean.txt"
 out_path = "knowledge_base/BNS/v2024/bns_chunks.json"
 
+ACT = "BNS"
+ACT_NAME = "Bharatiya Nyaya Sanhita, 2023"
+EFFECTIVE_FROM = "2024-07-01"
+
+# Sub-section level splits: "(2) Whoever...", "Explanation 1.—", "Illustrations.", "Exception.—"
+PART_PAT = re.compile(r"(?m)^\s*(?:\(\d{1,2}\)\s|Explanation\b|Illustrations?\b|Exception\b)")
+# Clause level splits, only used to break up parts that are still too long
+CLAUSE_PAT = re.compile(r"(?m)^\s*(?:\([a-z]{1,4}\)|Provided\b)")
+MAX_PART_CHARS = 1500
+MIN_PART_CHARS = 120
+
+def part_kind(part):
+    head = part.lstrip()[:12]
+    if head.startswith("Explanation"):
+        return "explanation"
+    if head.startswith("Illustration"):
+        return "illustration"
+    if head.startswith("Exception"):
+        return "exception"
+    return "subsection"
+
+def split_at(text, pat):
+    starts = [0] + [m.start() for m in pat.finditer(text) if m.start() > 0]
+    return [text[s:e].strip() for s, e in zip(starts, starts[1:] + [len(text)]) if text[s:e].strip()]
+
+def merge_small(parts, max_chars):
+    # Fold fragments (stray marginal notes, one-line clauses) into their neighbour
+    merged = []
+    for p in parts:
+        if merged and (len(p) < MIN_PART_CHARS or len(merged[-1]) < MIN_PART_CHARS) \
+                and len(merged[-1]) + len(p) <= max_chars:
+            merged[-1] = merged[-1] + "\n" + p
+        else:
+            merged.append(p)
+    return merged
+
+def split_section(body):
+    """(kind, text) sub-section / explanation / illustration parts, long ones split at clauses."""
+    parts = []
+    for i, part in enumerate(merge_small(split_at(body, PART_PAT), MAX_PART_CHARS)):
+        kind = "lead" if i == 0 else part_kind(part)
+        if len(part) <= MAX_PART_CHARS:
+            parts.append((kind, part))
+            continue
+        # Greedily pack consecutive clauses up to MAX_PART_CHARS
+        packed = []
+        for clause in split_at(part, CLAUSE_PAT):
+            if packed and len(packed[-1]) + len(clause) + 1 <= MAX_PART_CHARS:
+                packed[-1] = packed[-1] + "\n" + clause
+            else:
+                packed.append(clause)
+        parts.extend((kind, p) for p in packed)
+    return parts
+
 text = open(clean_path, "r", encoding="utf-8").read()
 
 # Split points: lines like "346. Whoever..."
@@ -12,6 +66,8 @@ matches = list(pat.finditer(text))
 print("Numbered provisions found:", len(matches))
 
 chunks = []
+parent_counts = {}
+sections = 0
 for i, m in enumerate(matches):
     sec = m.group(1)
     start = m.start()
@@ -26,14 +82,28 @@ for i, m in enumerate(matches):
     body = re.sub(r"(?m)^THE GAZETTE OF INDIA EXTRAORDINARY.*$", "", body).strip()
     body = re.sub(r"(?m)^_+$", "", body).strip()
 
-    chunks.append({
-        "act": "BNS",
-        "section": sec,
-        "effective_from": "2024-07-01",
-        "act_name": "Bharatiya Nyaya Sanhita, 2023",
-        "text": body
-    })
+    # Parent = the numbered section; duplicates (e.g. 338) get a suffix as at ingest
+    count = parent_counts.get(sec, 0)
+    parent_counts[sec] = count + 1
+    parent_id = f"{ACT}_2024_{sec}" if count == 0 else f"{ACT}_2024_{sec}_{count}"
+    header = f"{ACT_NAME}, Section {sec}"
+    sections += 1
+
+    for ordinal, (kind, part) in enumerate(split_section(body)):
+        chunks.append({
+            "act": ACT,
+            "section": sec,
+            "effective_from": EFFECTIVE_FROM,
+            "act_name": ACT_NAME,
+            "parent_id": parent_id,
+            "chunk_id": f"{parent_id}__{ordinal}",
+            "ordinal": ordinal,
+            "kind": kind,
+            "header": header,
+            "text": part
+        })
 
+print("Sections kept:", sections)
 print("Chunks created:", len(chunks))
 
 with open(out_path, "w", encoding="utf-8") as f:
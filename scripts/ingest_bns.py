@@ -13,6 +13,7 @@ BASE_DIR = Path(__file__).parent.parent
 sys.path.append(str(BASE_DIR))
 
 from app.chroma_store import get_collection, CHROMA_PATH, COLLECTION_NAME
+from scripts.build_provision_graph import build_graph
 
 CHUNKS_FILE_PATH = BASE_DIR / "knowledge_base" / "BNS" / "v2024" / "bns_chunks.json"
 BATCH_SIZE = 100  # Gemini limit per embed batch (keep <= 100)
@@ -80,16 +81,27 @@ def ingest_data():
         unique_id = f'BNS_2024_{section}' if count == 0 else f'BNS_2024_{section}_{count}'
         section_counts[section] += 1
 
-        batch_ids.append(unique_id)
-        batch_docs.append(c["text"])
-        batch_metas.append({
+        meta = {
             "law": c["act"],
             "act": c["act"],
             "section": c["section"],
             "effective_from": c["effective_from"],
             "version": "v2024",
             "type": "bare_act"
-        })
+        }
+        # Sub-section chunks (scripts/chunk_bns.py): retrieval aggregates them per parent section
+        if c.get("chunk_id"):
+            unique_id = c["chunk_id"]
+            meta.update({
+                "parent_id": c["parent_id"],
+                "ordinal": c["ordinal"],
+                "kind": c["kind"],
+                "header": c["header"],
+            })
+
+        batch_ids.append(unique_id)
+        batch_docs.append(c["text"])
+        batch_metas.append(meta)
 
         if len(batch_docs) >= BATCH_SIZE:
             flush_batch()
@@ -97,5 +109,8 @@ def ingest_data():
     flush_batch()
     print(f"✅ Successfully ingested {total_ingested} chunks.")
 
+    # 3. Rebuild the provision graph (old-code mappings, cross-references, chapters)
+    build_graph()
+
 if __name__ == "__main__":
     ingest_data()
@@ -0,0 +1,76 @@
+import sys
+from pathlib import Path
+from dotenv import load_dotenv
+
+# Load environment variables from .env file
+load_dotenv()
+
+# Add project root to sys.path to allow imports from app
+BASE_DIR = Path(__file__).parent.parent
+sys.path.append(str(BASE_DIR))
+
+from app.chroma_store import get_collection
+from app.services.retrieval_service import retrieve_sections
+from app.services.answer_service import answer_from_docs, prompt_hash, model_id
+from app.services.answer_store import AnswerStore, STORE_PATH, corpus_version
+from app.responses.refusals import NO_LAW_FOUND, MODEL_EMPTY_RESPONSE
+
+BATCH_SIZE = 50  # rows per SQLite transaction
+
+def precompute_answers():
+    # Run after scripts/ingest_bns.py: answers every (act, section) once via the
+    # same exact-match retrieval path the API uses and stores them for reuse.
+    try:
+        collection = get_collection()
+    except RuntimeError as e:
+        print(f"Error initializing collection: {e}")
+        print("Make sure GEMINI_API_KEY is set in your .env file.")
+        return
+
+    res = collection.get(include=["metadatas"])
+    keys = sorted({
+        (m.get("act") or m.get("law") or "Unknown", str(m.get("section")))
+        for m in (res.get("metadatas") or []) if m and m.get("section")
+    }, key=lambda k: (k[0], int(k[1]) if k[1].isdigit() else 0, k[1]))
+
+    if not keys:
+        print("No sections found in collection. Run ingestion first.")
+        return
+
+    cv, ph, model = corpus_version(), prompt_hash(), model_id()
+    print(f"Precomputing {len(keys)} sections (corpus={cv}, prompt={ph}, model={model}) into {STORE_PATH}")
+
+    store = AnswerStore(STORE_PATH, readonly=False)
+    rows, stored, skipped = [], 0, 0
+
+    for act, sec in keys:
+        # Only the section itself: cross-referenced sections the live lookup adds
+        # (exact_match=False) are left out of the stored answer
+        docs = [d for d in retrieve_sections(f"section {sec}")
+                if d.get("act") == act and d.get("exact_match")]
+        if not docs:
+            skipped += 1
+            continue
+
+        name = docs[0].get("title") or act
+        response = answer_from_docs(f"What does section {sec} of the {name} provide?", docs)
+        if response.answer in (NO_LAW_FOUND, MODEL_EMPTY_RESPONSE):
+            skipped += 1
+            continue
+
+        rows.append((act, sec, cv, ph, model, response.model_dump_json()))
+        if len(rows) >= BATCH_SIZE:
+            store.put_many(rows)
+            stored += len(rows)
+            rows = []
+            print(f"Stored {stored} / {len(keys)}")
+
+    if rows:
+        store.put_many(rows)
+        stored += len(rows)
+
+    pruned = store.prune(cv, ph, model)
+    print(f"✅ Stored {stored} answers, skipped {skipped}, pruned {pruned} stale entries.")
+
+if __name__ == "__main__":
+    precompute_answers()
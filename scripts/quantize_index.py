@@ -0,0 +1,78 @@
+import sys
+import json
+import argparse
+from pathlib import Path
+import yaml
+import numpy as np
+from dotenv import load_dotenv
+
+# Load environment variables from .env file
+load_dotenv()
+
+# Add project root to sys.path to allow imports from app
+BASE_DIR = Path(__file__).parent.parent
+sys.path.append(str(BASE_DIR))
+
+from app.chroma_store import get_collection, get_embedding_function
+from app.quantized_index import QuantizedIndex, QUANTIZED_INDEX_DIR, RESCORE_K
+from app.services.answer_store import corpus_version
+
+TEST_CASES_PATH = BASE_DIR / "app" / "evaluation" / "test_cases.yaml"
+REPORT_PATH = BASE_DIR / "app" / "evaluation" / "quantization_report.json"
+
+def recall_at_k(found, expected) -> float:
+    return len(set(found) & set(expected)) / max(1, len(expected))
+
+def quantize_index(ks, rescore_k):
+    # Run after scripts/ingest_bns.py; enable with INDEX_QUANTIZATION=int8|binary
+    try:
+        collection = get_collection()
+    except RuntimeError as e:
+        print(f"Error initializing collection: {e}")
+        print("Make sure GEMINI_API_KEY is set in your .env file.")
+        return
+
+    print(f"Building quantized index at {QUANTIZED_INDEX_DIR}...")
+    stats = QuantizedIndex.build(collection, QUANTIZED_INDEX_DIR, corpus_version())
+    if not stats["count"]:
+        print("Collection is empty. Run ingestion first.")
+        return
+    print(f"Indexed {stats['count']} vectors x {stats['dims']} dims")
+    for name in ("float32", "int8", "binary"):
+        size = stats[f"{name}_bytes"]
+        print(f"  {name:<8} {size / 1024:>10.1f} KiB  ({stats['float32_bytes'] / size:.1f}x smaller than float32)")
+
+    cases = yaml.safe_load(TEST_CASES_PATH.read_text(encoding="utf-8"))
+    queries = [c["query"] for c in cases]
+    qvecs = get_embedding_function()(queries)
+
+    report = {"index": stats, "rescore_k": rescore_k, "queries": len(queries), "recall": {}}
+    print(f"\nRecall against exact float32 search ({len(queries)} evaluation queries):")
+    for mode in ("int8", "binary"):
+        index = QuantizedIndex(QUANTIZED_INDEX_DIR, mode)
+        report["recall"][mode] = {}
+        for k in ks:
+            first_pass, rescored = [], []
+            for qvec in qvecs:
+                q = np.asarray(qvec, dtype=np.float32)
+                expected = index.exact_search(q, k)
+                q_norm = q / (np.linalg.norm(q) or 1.0)
+                first_pass.append(recall_at_k(index.first_pass(q_norm, k).tolist(), expected))
+                found, _ = index.search(q, k, rescore_k=rescore_k)
+                rescored.append(recall_at_k(found, expected))
+            report["recall"][mode][f"@{k}"] = {
+                "first_pass": float(np.mean(first_pass)),
+                "rescored": float(np.mean(rescored)),
+            }
+            print(f"  {mode:<7} recall@{k:<3} first-pass {np.mean(first_pass):.3f}   "
+                  f"with rescoring (shortlist {rescore_k}) {np.mean(rescored):.3f}")
+
+    REPORT_PATH.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    print(f"\nFull report saved to: {REPORT_PATH}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build the quantized index and report recall@k")
+    parser.add_argument("--k", type=int, nargs="+", default=[5, 25])
+    parser.add_argument("--rescore-k", type=int, default=RESCORE_K)
+    args = parser.parse_args()
+    quantize_index(args.k, args.rescore_k)
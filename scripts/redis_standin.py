@@ -0,0 +1,112 @@
+import time
+import asyncio
+import argparse
+
+# Minimal Redis-protocol (RESP2) server for exercising CACHE_BACKEND=redis locally
+# without installing Redis. Supports the commands RedisCache uses:
+# PING, GET, SET [EX seconds] [PX ms] [NX], DEL, EXISTS, FLUSHDB, DBSIZE.
+#
+#   python scripts/redis_standin.py --port 6379
+#   CACHE_BACKEND=redis CACHE_REDIS_URL=redis://127.0.0.1:6379/0 uvicorn app.main:app
+
+_data = {}  # key -> (value, expires_at or None)
+
+def _live(key):
+    item = _data.get(key)
+    if item is None:
+        return None
+    value, expires_at = item
+    if expires_at is not None and expires_at <= time.time():
+        del _data[key]
+        return None
+    return value
+
+def _bulk(value):
+    if value is None:
+        return b"$-1\r\n"
+    return b"$" + str(len(value)).encode() + b"\r\n" + value + b"\r\n"
+
+def _int(n):
+    return b":" + str(n).encode() + b"\r\n"
+
+def _error(msg):
+    return b"-ERR " + msg.encode() + b"\r\n"
+
+def handle_command(args):
+    cmd = args[0].upper()
+    if cmd == b"PING":
+        return b"+PONG\r\n"
+    if cmd in (b"SELECT", b"CLIENT", b"HELLO"):
+        return b"+OK\r\n"
+    if cmd == b"GET" and len(args) == 2:
+        return _bulk(_live(args[1]))
+    if cmd == b"SET" and len(args) >= 3:
+        key, value, expires_at, nx = args[1], args[2], None, False
+        opts = [a.upper() for a in args[3:]]
+        i = 0
+        while i < len(opts):
+            if opts[i] == b"NX":
+                nx = True
+            elif opts[i] in (b"EX", b"PX") and i + 1 < len(opts):
+                amount = int(args[3 + i + 1])
+                expires_at = time.time() + (amount if opts[i] == b"EX" else amount / 1000.0)
+                i += 1
+            else:
+                return _error("syntax error")
+            i += 1
+        if nx and _live(key) is not None:
+            return b"$-1\r\n"
+        _data[key] = (value, expires_at)
+        return b"+OK\r\n"
+    if cmd == b"DEL":
+        return _int(sum(1 for k in args[1:] if _live(k) is not None and _data.pop(k, None)))
+    if cmd == b"EXISTS":
+        return _int(sum(1 for k in args[1:] if _live(k) is not None))
+    if cmd == b"FLUSHDB":
+        _data.clear()
+        return b"+OK\r\n"
+    if cmd == b"DBSIZE":
+        return _int(len(_data))
+    return _error(f"unknown command '{args[0].decode(errors='replace')}'")
+
+async def _read_command(reader):
+    line = await reader.readline()
+    if not line:
+        return None
+    if not line.startswith(b"*"):
+        # inline command (e.g. from telnet / redis-cli ping)
+        return line.strip().split()
+    args = []
+    for _ in range(int(line[1:])):
+        header = await reader.readline()
+        size = int(header[1:])
+        payload = await reader.readexactly(size + 2)
+        args.append(payload[:-2])
+    return args
+
+async def _serve_client(reader, writer):
+    try:
+        while True:
+            args = await _read_command(reader)
+            if args is None:
+                break
+            if args:
+                writer.write(handle_command(args))
+                await writer.drain()
+    except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+        pass
+    finally:
+        writer.close()
+
+async def main(host, port):
+    server = await asyncio.start_server(_serve_client, host, port)
+    print(f"Redis stand-in listening on {host}:{port}")
+    async with server:
+        await server.serve_forever()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local Redis-protocol stand-in server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=6379)
+    args = parser.parse_args()
+    asyncio.run(main(args.host, args.port))
@@ -0,0 +1,219 @@
+import sys
+import json
+import time
+import hashlib
+import argparse
+import threading
+import urllib.request
+import urllib.error
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+
+# Replays a query log (app/core/query_log.py format) against a running server
+# or in-process get_answer, then reports latency percentiles and result drift
+# (section IDs / answer text that differ from what was logged).
+#
+#   python scripts/replay_queries.py logs/query_log.jsonl --url http://127.0.0.1:8000 --concurrency 8
+#   python scripts/replay_queries.py logs/query_log.jsonl --inproc --rate 20
+#
+# The server rate-limits per client (2 req/s, burst 10 by default), so a fast
+# HTTP replay from one address is mostly 429s. For load tests either start the
+# server with ASK_RATE_LIMIT_PER_SECOND=0 (no limit), or list a key in
+# ASK_API_KEYS, raise ASK_RATE_LIMIT_PER_SECOND / ASK_RATE_LIMIT_BURST to the
+# production per-client budget and pass it with --api-key.
+
+BASE_DIR = Path(__file__).parent.parent
+sys.path.append(str(BASE_DIR))
+
+def load_log(path, endpoint, limit):
+    records = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            rec = json.loads(line)
+            if rec.get("endpoint", "/ask") == endpoint and rec.get("status", 200) == 200:
+                records.append(rec)
+            if limit and len(records) >= limit:
+                break
+    return records
+
+def percentile(sorted_values, p):
+    if not sorted_values:
+        return 0.0
+    k = (len(sorted_values) - 1) * p / 100.0
+    lo, hi = int(k), min(int(k) + 1, len(sorted_values) - 1)
+    return sorted_values[lo] + (sorted_values[hi] - sorted_values[lo]) * (k - lo)
+
+def _answer_sha(answer):
+    return hashlib.sha256(answer.encode("utf-8")).hexdigest()[:16]
+
+def parse_headers(api_key, headers):
+    out = {"Content-Type": "application/json"}
+    if api_key:
+        out["X-API-Key"] = api_key
+    for h in headers or []:
+        name, sep, value = h.partition(":")
+        if not sep or not name.strip():
+            raise SystemExit(f"--header must look like 'Name: value', got {h!r}")
+        out[name.strip()] = value.strip()
+    return out
+
+def make_http_call(url, endpoint, timeout, headers):
+    def call(rec):
+        body = {"query": rec["query"]}
+        if endpoint == "/search":
+            body.update({k: rec[k] for k in ("top_k", "offset", "act") if rec.get(k) is not None})
+        req = urllib.request.Request(
+            url.rstrip("/") + endpoint, data=json.dumps(body).encode("utf-8"),
+            headers=headers,
+        )
+        try:
+            with urllib.request.urlopen(req, timeout=timeout) as resp:
+                data = json.loads(resp.read())
+                status = resp.status
+        except urllib.error.HTTPError as e:
+            return e.code, None, None
+        if endpoint == "/search":
+            return status, [f"{m['act']}:{m['section']}" for m in data["matches"]], None
+        return status, [f"{c['act']}:{c['section']}" for c in data["citations"]], _answer_sha(data["answer"])
+    return call
+
+def make_inproc_call(endpoint):
+    from app.core.config import load_env
+    load_env()
+    if endpoint == "/search":
+        from app.services.search_service import search
+        from schemas.request import SearchRequest
+
+        def call(rec):
+            params = {k: rec[k] for k in ("top_k", "offset", "act") if rec.get(k) is not None}
+            res = search(SearchRequest(query=rec["query"], **params))
+            return 200, [f"{m.act}:{m.section}" for m in res.matches], None
+        return call
+
+    from app.services.answer_service import get_answer
+
+    def call(rec):
+        res = get_answer(rec["query"])
+        return 200, [f"{c.act}:{c.section}" for c in res.citations], _answer_sha(res.answer)
+    return call
+
+def replay(records, call, concurrency, rate):
+    results = [None] * len(records)
+    lock = threading.Lock()
+
+    def run(i, scheduled):
+        # With a fixed rate, latency counts from the scheduled arrival so that
+        # queueing behind slow requests is not hidden (coordinated omission)
+        started = scheduled if scheduled is not None else time.perf_counter()
+        try:
+            status, sections, answer_sha = call(records[i])
+        except Exception as e:
+            status, sections, answer_sha = f"error: {type(e).__name__}", None, None
+        latency = (time.perf_counter() - started) * 1000.0
+        with lock:
+            results[i] = (latency, status, sections, answer_sha)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for i in range(len(records)):
+            scheduled = None
+            if rate:
+                # Open loop: fixed arrival schedule regardless of response times
+                scheduled = started + i / rate
+                delay = scheduled - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+            pool.submit(run, i, scheduled)
+    return results, time.perf_counter() - started
+
+def report(records, results, wall_seconds):
+    latencies = sorted(r[0] for r in results if r[1] == 200)
+    statuses = {}
+    for r in results:
+        statuses[str(r[1])] = statuses.get(str(r[1]), 0) + 1
+
+    compared = section_drift = answer_drift = 0
+    drift_examples = []
+    for rec, (_, status, sections, answer_sha) in zip(records, results):
+        if status != 200 or "section_ids" not in rec:
+            continue
+        compared += 1
+        if sections != rec["section_ids"]:
+            section_drift += 1
+            if len(drift_examples) < 10:
+                drift_examples.append({"query": rec["query"], "logged": rec["section_ids"], "replayed": sections})
+        if answer_sha and rec.get("answer_sha") and answer_sha != rec["answer_sha"]:
+            answer_drift += 1
+
+    summary = {
+        "requests": len(results),
+        "wall_seconds": round(wall_seconds, 3),
+        "throughput_rps": round(len(results) / wall_seconds, 2) if wall_seconds else 0.0,
+        "status": statuses,
+        "latency_ms": {
+            f"p{p}": round(percentile(latencies, p), 2) for p in (50, 90, 95, 99)
+        } | {"max": round(latencies[-1], 2) if latencies else 0.0},
+        "drift": {
+            "compared": compared,
+            "section_ids_changed": section_drift,
+            "answer_changed": answer_drift,
+            "section_drift_rate": round(section_drift / compared, 4) if compared else 0.0,
+        },
+        "drift_examples": drift_examples,
+    }
+
+    print("\n" + "=" * 30)
+    print("ILAP REPLAY REPORT")
+    print("=" * 30)
+    print(f"Requests:    {summary['requests']} in {summary['wall_seconds']} s ({summary['throughput_rps']} req/s)")
+    print(f"Status:      {statuses}")
+    lat = summary["latency_ms"]
+    print(f"Latency ms:  p50 {lat['p50']}  p90 {lat['p90']}  p95 {lat['p95']}  p99 {lat['p99']}  max {lat['max']}")
+    print(f"Drift:       {section_drift}/{compared} section sets changed, {answer_drift} answers changed")
+    for ex in drift_examples:
+        print(f"- {ex['query']!r}: {ex['logged']} -> {ex['replayed']}")
+    return summary
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a query log and report latency and drift")
+    parser.add_argument("log", help="JSONL query log (QUERY_LOG_PATH)")
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument("--url", default="http://127.0.0.1:8000", help="server to replay against")
+    target.add_argument("--inproc", action="store_true", help="call get_answer/search in this process")
+    parser.add_argument("--endpoint", choices=["/ask", "/search"], default="/ask")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--rate", type=float, default=0.0, help="requests per second (0 = as fast as concurrency allows)")
+    parser.add_argument("--limit", type=int, default=0)
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--api-key", help="sent as X-API-Key (must be listed in the server's ASK_API_KEYS)")
+    parser.add_argument("--header", action="append", help="extra request header 'Name: value' (repeatable)")
+    parser.add_argument("--output", help="write the JSON summary here")
+    args = parser.parse_args()
+
+    records = load_log(args.log, args.endpoint, args.limit)
+    if not records:
+        print(f"No {args.endpoint} records found in {args.log}")
+        return
+
+    if args.inproc:
+        call = make_inproc_call(args.endpoint)
+    else:
+        call = make_http_call(args.url, args.endpoint, args.timeout, parse_headers(args.api_key, args.header))
+    mode = "in-process" if args.inproc else args.url
+    print(f"Replaying {len(records)} {args.endpoint} requests against {mode} "
+          f"(concurrency {args.concurrency}, rate {args.rate or 'unbounded'})...")
+
+    results, wall = replay(records, call, args.concurrency, args.rate)
+    summary = report(records, results, wall)
+    if summary["status"].get("429"):
+        print(f"\n⚠️ {summary['status']['429']} requests were rate limited; see the header of this script "
+              "for lifting the per-client limit during load tests.")
+    if args.output:
+        Path(args.output).write_text(json.dumps(summary, indent=2), encoding="utf-8")
+        print(f"\nSummary saved to: {args.output}")
+
+if __name__ == "__main__":
+    main()
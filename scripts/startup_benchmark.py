@@ -0,0 +1,143 @@
+import os
+import re
+import sys
+import json
+import time
+import socket
+import argparse
+import subprocess
+import statistics
+import urllib.request
+import urllib.error
+from pathlib import Path
+
+# Measures API cold-start cost and fails on regressions:
+#   1. `python -X importtime -c "import app.main"` (median of N runs) vs a budget
+#      and vs the saved baseline
+#   2. time from launching uvicorn to the first successful POST /ask
+#
+#   python scripts/startup_benchmark.py                 # check
+#   python scripts/startup_benchmark.py --update-baseline
+
+BASE_DIR = Path(__file__).parent.parent
+BASELINE_PATH = BASE_DIR / "app" / "evaluation" / "startup_baseline.json"
+
+IMPORT_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+def measure_import(module: str):
+    """One fresh interpreter; returns (cumulative ms of module, its direct imports by cost)."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=BASE_DIR, capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{proc.stderr[-2000:]}")
+
+    rows = []
+    for line in proc.stderr.splitlines():
+        m = IMPORT_LINE.match(line)
+        if m:
+            rows.append((int(m.group(2)), len(m.group(3)), m.group(4)))
+
+    pos = next((i for i, r in enumerate(rows) if r[2] == module), None)
+    if pos is None:
+        return 0.0, {}
+    total_us, module_indent, _ = rows[pos]
+
+    # -X importtime prints children before their parent, one indent step (two
+    # spaces) deeper; walk back from the module's row to its previous sibling
+    children = {}
+    for cumulative, indent, name in reversed(rows[:pos]):
+        if indent <= module_indent:
+            break
+        if indent == module_indent + 2:
+            children[name] = children.get(name, 0) + cumulative
+    return total_us / 1000.0, {k: v / 1000.0 for k, v in children.items()}
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+def measure_first_ask(query: str, timeout: float) -> float:
+    port = _free_port()
+    started = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1", "--port", str(port)],
+        cwd=BASE_DIR, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    body = json.dumps({"query": query}).encode("utf-8")
+    try:
+        while time.perf_counter() - started < timeout:
+            if server.poll() is not None:
+                raise RuntimeError("uvicorn exited before serving /ask")
+            req = urllib.request.Request(
+                f"http://127.0.0.1:{port}/ask", data=body,
+                headers={"Content-Type": "application/json"},
+            )
+            try:
+                with urllib.request.urlopen(req, timeout=timeout) as resp:
+                    if resp.status == 200:
+                        return (time.perf_counter() - started) * 1000.0
+            except (urllib.error.URLError, ConnectionError):
+                time.sleep(0.05)
+        raise RuntimeError(f"no successful /ask within {timeout}s")
+    finally:
+        server.terminate()
+        server.wait(timeout=10)
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="API start-up benchmark with regression check")
+    parser.add_argument("--module", default="app.main")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--import-budget-ms", type=float,
+                        default=float(os.getenv("STARTUP_IMPORT_BUDGET_MS", "800")))
+    parser.add_argument("--tolerance", type=float, default=0.20,
+                        help="allowed slowdown vs baseline (fraction)")
+    parser.add_argument("--skip-ask", action="store_true", help="skip the time-to-first-/ask check")
+    parser.add_argument("--ask-query", default="What is the punishment for theft in India?")
+    parser.add_argument("--ask-timeout", type=float, default=120.0)
+    parser.add_argument("--update-baseline", action="store_true")
+    args = parser.parse_args()
+
+    runs = [measure_import(args.module) for _ in range(args.runs)]
+    import_ms = statistics.median(r[0] for r in runs)
+    _, children = runs[-1]
+
+    print(f"import {args.module}: median {import_ms:.1f} ms over {args.runs} runs "
+          f"(budget {args.import_budget_ms:.0f} ms)")
+    print(f"Heaviest direct imports of {args.module}:")
+    for name, ms in sorted(children.items(), key=lambda kv: kv[1], reverse=True)[:10]:
+        print(f"  {ms:>8.1f} ms  {name}")
+
+    result = {"import_ms": round(import_ms, 1)}
+    if not args.skip_ask:
+        first_ask_ms = measure_first_ask(args.ask_query, args.ask_timeout)
+        result["first_ask_ms"] = round(first_ask_ms, 1)
+        print(f"time to first successful /ask: {first_ask_ms:.1f} ms")
+
+    if args.update_baseline:
+        BASELINE_PATH.write_text(json.dumps(result, indent=2) + "\n", encoding="utf-8")
+        print(f"Baseline saved to: {BASELINE_PATH}")
+        return 0
+
+    failures = []
+    if import_ms > args.import_budget_ms:
+        failures.append(f"import time {import_ms:.1f} ms exceeds budget {args.import_budget_ms:.0f} ms")
+    if BASELINE_PATH.exists():
+        baseline = json.loads(BASELINE_PATH.read_text(encoding="utf-8"))
+        for key, value in result.items():
+            ref = baseline.get(key)
+            if ref and value > ref * (1 + args.tolerance):
+                failures.append(f"{key} regressed: {value:.1f} ms vs baseline {ref:.1f} ms")
+
+    if failures:
+        print("\n❌ STARTUP REGRESSION")
+        for f in failures:
+            print(f"- {f}")
+        return 1
+    print("\n✅ Start-up within budget.")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())